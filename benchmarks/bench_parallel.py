@@ -0,0 +1,63 @@
+"""Mide cómo escala el recorrido paralelo con el número de hilos.
+
+Genera un árbol sintético en una carpeta temporal y añade una latencia
+artificial a cada ``os.scandir`` para simular un montaje NFS/SMB.
+
+    python benchmarks/bench_parallel.py --latency 2 --workers 1 2 4 8 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from folderscan import FolderScanner
+from treegen import TreeShape, make_tree
+
+
+def slow_scandir(latency):
+    """Envuelve ``os.scandir`` para que cada lectura de carpeta tarde ``latency`` segundos"""
+    real_scandir = os.scandir
+
+    def scandir(path="."):
+        time.sleep(latency)
+        return real_scandir(path)
+    return scandir
+
+
+def run(root, workers):
+    start = time.perf_counter()
+    results = sorted((r.path, r.size) for r in FolderScanner(root, workers=workers).scan())
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=2.0, help="Latencia por carpeta en ms")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "arbol")
+        folders, _, _ = make_tree(root, TreeShape(args.depth, args.fanout, args.files, 4096))
+        print(f"{folders} carpetas, {folders * args.files} ficheros, latencia {args.latency} ms")
+
+        os.scandir = slow_scandir(args.latency / 1000)
+        baseline_time, baseline = None, None
+        print(f"{'hilos':>6} {'segundos':>10} {'aceleración':>12}")
+        for workers in args.workers:
+            elapsed, results = run(root, workers)
+            if baseline is None:
+                baseline_time, baseline = elapsed, results
+            elif results != baseline:
+                sys.exit(f"Resultados distintos con {workers} hilos")
+            print(f"{workers:>6} {elapsed:>10.3f} {baseline_time / elapsed:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Mide guardar, abrir y comparar instantáneas grandes.
+
+No toca el disco salvo para los ficheros de instantánea: parte de resultados
+sintéticos como los de ``bench_store.py`` y cambia unas pocas carpetas.
+
+    python benchmarks/bench_snapshot.py --folders 1000000 --changes 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_store import synthetic_results
+from folderscan.snapshot import diff_snapshots, load_snapshot, save_snapshot
+from folderscan.store import ResultStore, np
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=1_000_000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--changes", type=int, default=100, help="Carpetas que crecen entre las dos instantáneas")
+    args = parser.parse_args()
+
+    print(f"{args.folders} carpetas, {args.changes} cambios, numpy: {'sí' if np is not None else 'no'}")
+    old, new = ResultStore("/datos"), ResultStore("/datos")
+    for result in synthetic_results("/datos", args.folders, args.fanout):
+        old.add(result)
+        new.add(result)
+    # Hacer crecer algunas carpetas y a la vez todos sus antecesores
+    rng = random.Random(1)
+    for index in rng.sample(new.indices(), args.changes):
+        growth = rng.randrange(1, 1 << 30)
+        while index >= 0:
+            new.sizes[index] += growth
+            index = new.parents[index]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = os.path.join(tmp, "old.snap"), os.path.join(tmp, "new.snap")
+        timed("guardar (con firmas)", save_snapshot, old, old_path)
+        save_snapshot(new, new_path)
+        print(f"{'tamaño del fichero':<28} {os.path.getsize(old_path) / 1e6:8.1f} MB")
+        old = timed("abrir (mmap)", load_snapshot, old_path)
+        # Lo que necesita la interfaz para enseñar algo: el primer nivel del árbol y las mayores
+        timed("primer nivel del árbol", lambda: [(old.name(i), old.sizes[i]) for i in old.children(old.root_index)])
+        timed("100 mayores con su ruta", lambda: [old.path(i) for i in old.largest(100)])
+        new = load_snapshot(new_path)
+        changes = timed("comparar", diff_snapshots, old, new)
+        print(f"{len(changes)} carpetas cambiadas; la que más crece: {changes[0].path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Mide cuánto tarda en arrancar ``folderscan`` sin interfaz.
+
+Lanza cada orden varias veces en un proceso nuevo y da la mediana del tiempo
+de pared, descontando lo que tarda un intérprete vacío; después lista los
+módulos que más cuestan de importar (``python -X importtime``). Una consulta
+sin interfaz sobre una carpeta pequeña no debería pasar de unas decenas de ms
+por encima del intérprete, porque ``tkinter``, ``sqlite3``, ``numpy`` y
+``hashlib`` solo se cargan si se usan.
+
+    python benchmarks/bench_startup.py --repeat 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_time(argv, repeat):
+    """Mediana en segundos de ``argv`` lanzado ``repeat`` veces"""
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def import_times(code, top):
+    """Los ``top`` módulos con más tiempo acumulado de importación al ejecutar ``code``"""
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, check=True,
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, module = line.split("|")
+            rows.append((int(cumulative), module.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="Módulos a listar por tiempo de importación")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "a", "b"))
+        with open(os.path.join(tmp, "a", "b", "f"), "wb") as f:
+            f.write(b"x" * 1000)
+        commands = [
+            ("intérprete vacío", [sys.executable, "-c", "pass"]),
+            ("import folderscan", [sys.executable, "-c", "import folderscan"]),
+            ("import folderscan.cli", [sys.executable, "-c", "import folderscan.cli"]),
+            ("python -m folderscan", [sys.executable, "-m", "folderscan", tmp]),
+            ("python -m folderscan --top", [sys.executable, "-m", "folderscan", "--top", "5", tmp]),
+            ("import folderscan.app", [sys.executable, "-c", "import folderscan.app"]),
+        ]
+        base = None
+        for label, argv in commands:
+            try:
+                seconds = wall_time(argv, args.repeat)
+            except subprocess.CalledProcessError as e:
+                print(f"{label:<28} falla: {e}")
+                continue
+            base = seconds if base is None else base
+            print(f"{label:<28} {seconds * 1000:8.1f} ms  (+{(seconds - base) * 1000:.1f} ms)")
+
+    print("\nMódulos más lentos de importar con folderscan.cli:")
+    for cumulative, module in import_times("import folderscan.cli", args.top):
+        print(f"{cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
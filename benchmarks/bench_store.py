@@ -0,0 +1,94 @@
+"""Compara la memoria de ResultStore con la lista de tuplas ``(ruta, tamaño)``.
+
+No toca el disco: genera resultados sintéticos en postorden como los que
+entrega ``FolderScanner``.
+
+    python benchmarks/bench_store.py --folders 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from folderscan import FolderResult
+from folderscan.store import ResultStore, np
+
+NAMES = ["src", "build", "node_modules", "lib", "test", "docs", "assets", "cache", "__pycache__", "dist"]
+
+
+def synthetic_results(root, count, fanout, seed=0):
+    """Genera ``count`` resultados en postorden con ``fanout`` subcarpetas por carpeta"""
+    rng = random.Random(seed)
+    produced = 0
+
+    def walk(path, depth):
+        nonlocal produced
+        size = rng.randrange(1 << 20)
+        children = fanout if depth < 12 else 0
+        for i in range(children):
+            if produced >= count - 1:
+                break
+            produced += 1
+            child_size = yield from walk(os.path.join(path, f"{NAMES[i % len(NAMES)]}{i // len(NAMES) or ''}"), depth + 1)
+            size += child_size
+        yield FolderResult(path, size, 1, 0, 0)
+        return size
+
+    yield from walk(root, 0)
+
+
+def measure(build):
+    """Memoria que queda ocupada tras ``build`` (incluidas las rutas que conserve)"""
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=500_000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--top", type=int, default=100)
+    args = parser.parse_args()
+    root = "/srv/datos/proyectos"
+
+    def results():
+        return synthetic_results(root, args.folders, args.fanout)
+
+    # Los resultados se generan dentro de la medida: cada estructura paga las cadenas que conserva
+    tuples, tuples_bytes = measure(lambda: [(r.path, r.size) for r in results()])
+    store, store_bytes = measure(lambda: _fill(ResultStore(root), results()))
+    count = len(tuples)
+    print(f"{count} carpetas, numpy: {'sí' if np is not None else 'no'}")
+    print(f"{'estructura':<20} {'MiB':>10} {'bytes/carpeta':>14}")
+    for name, nbytes in (("lista de tuplas", tuples_bytes), ("ResultStore", store_bytes)):
+        print(f"{name:<20} {nbytes / 2**20:>10.1f} {nbytes / count:>14.1f}")
+
+    for name, run in (("ordenar tuplas por tamaño", lambda: sorted(tuples, key=lambda x: x[1], reverse=True)),
+                      ("ordenar store por tamaño", store.order_by_size),
+                      ("ordenar tuplas por ruta", lambda: sorted(tuples)),
+                      ("ordenar store por ruta", store.order_by_name),
+                      (f"top {args.top} tuplas", lambda: sorted(tuples, key=lambda x: x[1], reverse=True)[:args.top]),
+                      (f"top {args.top} store", lambda: store.largest(args.top))):
+        start = time.perf_counter()
+        run()
+        print(f"{name:<28} {time.perf_counter() - start:>8.3f} s")
+
+
+def _fill(store, results):
+    for result in results:
+        store.add(result)
+    return store
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Compara el cálculo de tamaños de la interfaz y del motor ``folderscan``.
+
+Genera árboles sintéticos con ``treegen`` (ancho, profundo, muchos ficheros
+diminutos, pocos ficheros enormes dispersos...), ejecuta la interfaz sin
+pantalla con ``tkstub``, con cada barra de progreso, y mide el tiempo, los ficheros por segundo, las
+llamadas al sistema de ficheros (``scandir``/``stat``) y el pico de memoria.
+Los resultados se guardan en JSON para compararlos con una ejecución anterior:
+
+    python benchmarks/bench_variants.py --output bench.json
+    python benchmarks/bench_variants.py --compare bench.json --threshold 0.15
+
+Con ``--compare`` el programa termina con código 1 si alguna medida empeora
+más que el umbral.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import tkstub  # noqa: E402
+from treegen import SHAPES, ensure_tree  # noqa: E402
+
+tkstub.install()
+
+from folderscan import ScanCheckpoint, ScanIndex, folder_sizes  # noqa: E402
+
+from folderscan.app import FolderAnalyzerApp  # noqa: E402
+
+# Nombre en el informe -> barra de progreso de la interfaz
+VARIANTS = {"interfaz ttk": "ttk", "interfaz tqdm": "tqdm"}
+
+
+def original_folder_sizes(root):
+    """Algoritmo de las variantes antes del motor: un ``os.walk`` completo por subcarpeta.
+
+    Sin la pausa de 10 ms por carpeta ni la actualización de la interfaz, que
+    solo añadían un coste fijo.
+    """
+    def get_folder_size(folder_path):
+        total_size = 0
+        for dirpath, dirnames, filenames in os.walk(folder_path):
+            for filename in filenames:
+                total_size += os.path.getsize(os.path.join(dirpath, filename))
+        return total_size
+
+    folders = []
+    for dirpath, dirnames, _ in os.walk(root):
+        for dirname in dirnames:
+            full_path = os.path.join(dirpath, dirname)
+            folders.append((full_path, get_folder_size(full_path)))
+    return folders
+
+
+def variant_runner(progress, tmp):
+    """Devuelve una función que escanea ``root`` con la interfaz y la barra de progreso ``progress``"""
+    if progress == "tqdm":
+        importlib.import_module("tqdm")  # Sin tqdm instalado la variante se omite
+    index_path = os.path.join(tmp, f"{progress}.sqlite3")
+
+    def run(root):
+        tk = tkstub.Tk()
+        app = FolderAnalyzerApp(tk, progress=progress)
+        # Índice vacío en cada ejecución: se mide el primer escaneo, no el incremental
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        app.index = ScanIndex(index_path)
+        app.checkpoint = ScanCheckpoint(os.path.join(tmp, f"{progress}-checkpoint.sqlite3"))
+        app.selected_folders = [root]
+        app.start_scan_thread()
+        tk.run_until(lambda: not app.scan_pump.running)
+        return app.folders
+    return run
+
+
+def benchmarks(tmp):
+    """Pares ``(nombre, función)``; cada función recibe la raíz y escanea el árbol"""
+    warm_index = ScanIndex(os.path.join(tmp, "warm.sqlite3"))
+    yield "original", original_folder_sizes
+    yield "motor", folder_sizes
+    yield "motor 4 hilos", lambda root: folder_sizes(root, workers=4)
+    yield "motor con índice", lambda root: folder_sizes(root, index=warm_index)
+    for name, progress in VARIANTS.items():
+        try:
+            yield name, variant_runner(progress, tmp)
+        except ImportError as e:
+            yield name, e
+
+
+class _CountingScandir:
+    """Iterador de ``os.scandir`` que cuenta los ``stat`` hechos sobre sus entradas"""
+
+    def __init__(self, it, counts):
+        self._it = it
+        self._counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _CountingEntry(next(self._it), self._counts)
+
+    def close(self):
+        self._it.close()
+
+
+class _CountingEntry:
+    __slots__ = ("_entry", "_counts", "_stat")
+
+    def __init__(self, entry, counts):
+        self._entry = entry
+        self._counts = counts
+        self._stat = False
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+    def stat(self, *, follow_symlinks=True):
+        if not self._stat:  # ``DirEntry`` guarda el resultado: solo la primera llamada llega al sistema
+            self._counts["stat"] += 1
+            self._stat = True
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+def count_fs_calls(run, root):
+    """Ejecuta ``run(root)`` contando ``scandir``, ``listdir`` y ``stat``/``lstat``"""
+    counts = {"scandir": 0, "stat": 0}
+    real = {name: getattr(os, name) for name in ("scandir", "listdir", "stat", "lstat")}
+
+    def scandir(path="."):
+        counts["scandir"] += 1
+        return _CountingScandir(real["scandir"](path), counts)
+
+    def listdir(path="."):
+        counts["scandir"] += 1
+        return real["listdir"](path)
+
+    def stat(path, *args, **kwargs):
+        counts["stat"] += 1
+        return real["stat"](path, *args, **kwargs)
+
+    def lstat(path, *args, **kwargs):
+        counts["stat"] += 1
+        return real["lstat"](path, *args, **kwargs)
+
+    os.scandir, os.listdir, os.stat, os.lstat = scandir, listdir, stat, lstat
+    try:
+        run(root)
+    finally:
+        for name, func in real.items():
+            setattr(os, name, func)
+    return counts
+
+
+def peak_memory(run, root):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(root)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(run, root, files, repeat):
+    run(root)  # Calentamiento: caché de páginas del sistema de ficheros e importaciones
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(root)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "seconds": best,
+        "median_seconds": statistics.median(times),
+        "files_per_second": files / best if best else None,
+        "fs_calls": count_fs_calls(run, root),
+        "peak_bytes": peak_memory(run, root),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current, threshold):
+    """Imprime las diferencias y devuelve la lista de medidas que empeoran más que ``threshold``"""
+    regressions = []
+    print(f"\n{'árbol':<10} {'medida':<24} {'antes':>10} {'ahora':>10} {'cambio':>8}")
+    for shape, results in current["results"].items():
+        for name, result in results.items():
+            old = previous.get("results", {}).get(shape, {}).get(name)
+            if not old or "skipped" in old or "skipped" in result:
+                continue
+            for key, label in (("seconds", "tiempo"), ("peak_bytes", "memoria")):
+                change = result[key] / old[key] - 1 if old[key] else 0.0
+                mark = " !" if change > threshold else ""
+                print(f"{shape:<10} {name + ' ' + label:<24} {old[key]:>10.4g} {result[key]:>10.4g} "
+                      f"{change:>+7.0%}{mark}")
+                if change > threshold:
+                    regressions.append((shape, name, key, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES))
+    parser.add_argument("--only", nargs="+", help="Medir solo estos benchmarks (p. ej. motor 'interfaz ttk')")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--trees", help="Carpeta donde generar y conservar los árboles entre ejecuciones")
+    parser.add_argument("--output", help="Fichero JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Empeoramiento tolerado (0.15 = 15 %%)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+        },
+        "shapes": {},
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = args.trees or tmp
+        for shape_name in args.shapes:
+            shape = SHAPES[shape_name]
+            root = os.path.join(trees, shape_name)
+            folders, files, total = ensure_tree(root, shape)
+            report["shapes"][shape_name] = {"shape": shape._asdict(), "folders": folders, "files": files,
+                                            "bytes": total}
+            print(f"\n{shape_name}: {folders} carpetas, {files} ficheros")
+            print(f"{'':<18} {'segundos':>9} {'ficheros/s':>11} {'scandir':>8} {'stat':>8} {'pico KiB':>9}")
+            results = report["results"][shape_name] = {}
+            reference = sorted(folder_sizes(root))
+            for name, run in benchmarks(tmp):
+                if args.only and name not in args.only:
+                    continue
+                if isinstance(run, Exception):
+                    results[name] = {"skipped": str(run)}
+                    print(f"{name:<18} omitido: {run}")
+                    continue
+                if name not in VARIANTS and sorted(run(root)) != reference:
+                    sys.exit(f"{name} no da los mismos tamaños que el motor en serie")
+                result = results[name] = measure(run, root, files, args.repeat)
+                print(f"{name:<18} {result['seconds']:>9.4f} {result['files_per_second']:>11.0f} "
+                      f"{result['fs_calls']['scandir']:>8} {result['fs_calls']['stat']:>8} "
+                      f"{result['peak_bytes'] / 1024:>9.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        regressions = compare(previous, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} medidas empeoran más de un {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Sustituto mínimo de ``tkinter`` para ejecutar las variantes sin pantalla.
+
+``install()`` registra los módulos falsos en ``sys.modules`` antes de importar
+las variantes. Los widgets aceptan cualquier opción y no dibujan nada; el
+``Treeview`` guarda sus filas para que insertar y borrar cuesten algo parecido
+a lo real, y ``Tk.after`` encola las llamadas para que ``run_until`` las
+ejecute en el hilo del benchmark.
+"""
+import heapq
+import itertools
+import sys
+import time
+import types
+
+BOTH, X, Y, LEFT, RIGHT, TOP, BOTTOM, VERTICAL, HORIZONTAL, END = (
+    "both", "x", "y", "left", "right", "top", "bottom", "vertical", "horizontal", "end")
+
+
+class TclError(Exception):
+    pass
+
+
+class Widget:
+    def __init__(self, *args, **options):
+        self.options = dict(options)
+
+    def __getattr__(self, name):
+        # pack, bind, heading, column, create_window... no hacen nada
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **options: None
+
+    def configure(self, *args, **options):
+        # ``Style.configure`` recibe además el nombre del estilo
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, option):
+        return self.options.get(option, "")
+
+    def __setitem__(self, option, value):
+        self.options[option] = value
+
+    def __getitem__(self, option):
+        return self.options.get(option, 0)
+
+    def state(self, states=None):
+        self.options["state"] = states
+
+
+class Tk(Widget):
+    def __init__(self):
+        super().__init__()
+        self._calls = []
+        self._ids = itertools.count()
+
+    def after(self, ms, func, *args):
+        job = next(self._ids)
+        heapq.heappush(self._calls, (time.monotonic() + ms / 1000, job, func, args))
+        return job
+
+    def after_cancel(self, job):
+        self._calls = [call for call in self._calls if call[1] != job]
+        heapq.heapify(self._calls)
+
+    def run_until(self, done, max_wait=0.005):
+        """Ejecuta las llamadas de ``after`` hasta que ``done()`` sea cierto.
+
+        Las esperas se recortan a ``max_wait`` segundos para que el intervalo de
+        refresco de la interfaz no domine el tiempo medido.
+        """
+        while not done():
+            if not self._calls:
+                time.sleep(max_wait)
+                continue
+            due, _, func, args = heapq.heappop(self._calls)
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, max_wait))
+            func(*args)
+
+
+class Variable:
+    def __init__(self, master=None, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, mode, callback):
+        return "trace"
+
+
+class Treeview(Widget):
+    def __init__(self, *args, **options):
+        super().__init__(*args, **options)
+        self._items = {"": {"parent": None, "children": [], "values": (), "text": ""}}
+        self._ids = itertools.count()
+        self._focus = ""
+
+    def insert(self, parent, index, iid=None, text="", values=(), **options):
+        iid = str(iid) if iid is not None else f"I{next(self._ids)}"
+        parent = str(parent)
+        if iid in self._items:
+            raise TclError(f'Item {iid} already exists')
+        self._items[iid] = {"parent": parent, "children": [], "values": tuple(values), "text": text}
+        children = self._items[parent]["children"]
+        children.append(iid) if index == "end" else children.insert(int(index), iid)
+        return iid
+
+    def delete(self, *items):
+        for iid in map(str, items):
+            item = self._items.pop(iid)
+            siblings = self._items[item["parent"]]["children"]
+            if iid in siblings:  # Las filas separadas con set_children ya no están entre los hijos
+                siblings.remove(iid)
+            pending = list(item["children"])
+            while pending:
+                pending.extend(self._items.pop(pending.pop())["children"])
+
+    def get_children(self, item=""):
+        return tuple(self._items[str(item)]["children"])
+
+    def set_children(self, item, *children):
+        item = str(item)
+        for child in map(str, children):
+            old = self._items[child]["parent"]
+            if old != item:
+                self._items[old]["children"].remove(child)
+                self._items[child]["parent"] = item
+        self._items[item]["children"] = [str(child) for child in children]
+
+    def exists(self, item):
+        return str(item) in self._items
+
+    def item(self, item, option=None, **options):
+        data = self._items[str(item)]
+        if options:
+            data.update((key, tuple(value) if key == "values" else value) for key, value in options.items())
+            return None
+        return data.get(option) if option else dict(data)
+
+    def focus(self, item=None):
+        if item is None:
+            return self._focus
+        self._focus = str(item)
+
+
+def install():
+    """Registra ``tkinter`` y sus submódulos falsos en ``sys.modules``"""
+    tkinter = types.ModuleType("tkinter")
+    names = {
+        "Tk": Tk, "TclError": TclError, "Frame": Widget, "Canvas": Widget, "Scrollbar": Widget,
+        "LabelFrame": Widget, "Toplevel": Widget, "Label": Widget, "Button": Widget, "IntVar": Variable,
+        "BooleanVar": Variable, "StringVar": Variable, "BOTH": BOTH, "X": X, "Y": Y, "LEFT": LEFT, "RIGHT": RIGHT, "TOP": TOP,
+        "BOTTOM": BOTTOM, "VERTICAL": VERTICAL, "HORIZONTAL": HORIZONTAL, "END": END,
+    }
+    vars(tkinter).update(names)
+    tkinter.__all__ = list(names)
+
+    ttk = types.ModuleType("tkinter.ttk")
+    for name in ("Style", "Button", "Label", "Entry", "Progressbar", "Spinbox", "Checkbutton", "Scrollbar", "Frame",
+                 "Notebook"):
+        setattr(ttk, name, Widget)
+    ttk.Treeview = Treeview
+
+    filedialog = types.ModuleType("tkinter.filedialog")
+    filedialog.askdirectory = filedialog.asksaveasfilename = filedialog.askopenfilename = lambda **options: ""
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.askyesno = lambda *args, **options: False
+    messagebox.showinfo = messagebox.showerror = lambda *args, **options: None
+
+    tkinter.ttk, tkinter.filedialog, tkinter.messagebox = ttk, filedialog, messagebox
+    sys.modules.update({"tkinter": tkinter, "tkinter.ttk": ttk, "tkinter.filedialog": filedialog,
+                        "tkinter.messagebox": messagebox})
@@ -0,0 +1,93 @@
+"""Genera árboles de carpetas sintéticos y reproducibles para los benchmarks.
+
+    python benchmarks/treegen.py /tmp/arbol --shape ancho
+    python benchmarks/treegen.py /tmp/arbol --depth 3 --fanout 8 --files 20 --file-size 1000
+"""
+import argparse
+import json
+import os
+import shutil
+from typing import NamedTuple
+
+
+class TreeShape(NamedTuple):
+    """Forma de un árbol: ``fanout`` subcarpetas por nivel y ``files`` ficheros por carpeta"""
+    depth: int
+    fanout: int
+    files: int
+    file_size: int  # Tamaño máximo de cada fichero; el real varía de forma determinista
+    sparse: bool = False  # Ficheros dispersos: ocupan ``file_size`` sin escribir datos
+
+
+SHAPES = {
+    "ancho": TreeShape(depth=2, fanout=60, files=5, file_size=4096),
+    "profundo": TreeShape(depth=60, fanout=1, files=20, file_size=4096),
+    "diminutos": TreeShape(depth=3, fanout=6, files=200, file_size=16),
+    "dispersos": TreeShape(depth=2, fanout=4, files=2, file_size=1 << 30, sparse=True),
+    "mixto": TreeShape(depth=4, fanout=4, files=10, file_size=4096),
+}
+
+
+def file_size(shape, i):
+    return shape.file_size if shape.sparse else i * 37 % (shape.file_size + 1)
+
+
+def make_tree(root, shape):
+    """Crea el árbol y devuelve ``(carpetas, ficheros, bytes)``"""
+    folders = files = total = 0
+    level = [root]
+    for d in range(shape.depth + 1):
+        next_level = []
+        for folder in level:
+            os.makedirs(folder, exist_ok=True)
+            folders += 1
+            for i in range(shape.files):
+                size = file_size(shape, i)
+                with open(os.path.join(folder, f"f{i}.dat"), "wb") as f:
+                    if shape.sparse:
+                        f.truncate(size)
+                    else:
+                        f.write(b"x" * size)
+                files += 1
+                total += size
+            if d < shape.depth:
+                next_level.extend(os.path.join(folder, f"d{i}") for i in range(shape.fanout))
+        level = next_level
+    return folders, files, total
+
+
+def ensure_tree(root, shape):
+    """Como ``make_tree``, pero reutiliza el árbol si ya se generó con la misma forma"""
+    marker = os.path.abspath(root) + ".treegen.json"  # Fuera del árbol para no alterar los totales
+    try:
+        with open(marker) as f:
+            saved = json.load(f)
+        if saved["shape"] == list(shape) and os.path.isdir(root):
+            return tuple(saved["counts"])
+    except (OSError, ValueError, KeyError):
+        pass
+    shutil.rmtree(root, ignore_errors=True)
+    counts = make_tree(root, shape)
+    with open(marker, "w") as f:
+        json.dump({"shape": list(shape), "counts": counts}, f)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="Carpeta donde crear el árbol")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="mixto")
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--fanout", type=int)
+    parser.add_argument("--files", type=int)
+    parser.add_argument("--file-size", type=int)
+    parser.add_argument("--sparse", action="store_true", default=None)
+    args = parser.parse_args()
+    shape = SHAPES[args.shape]._replace(**{field: value for field, value in vars(args).items()
+                                          if field in TreeShape._fields and value is not None})
+    folders, files, total = ensure_tree(args.root, shape)
+    print(f"{folders} carpetas, {files} ficheros, {total} bytes en {args.root}")
+
+
+if __name__ == "__main__":
+    main()
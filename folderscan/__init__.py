@@ -0,0 +1,43 @@
+"""Motor de escaneo del Analizador de Carpetas.
+
+Los nombres públicos se importan de su módulo la primera vez que se usan
+(PEP 562), así que ``import folderscan`` no carga ``sqlite3``, ``hashlib`` ni
+``tkinter`` hasta que hacen falta. La interfaz gráfica está en
+``folderscan.app``.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "FolderResult": "engine",
+    "FolderScanner": "engine",
+    "ScanCancelled": "engine",
+    "folder_size": "engine",
+    "folder_sizes": "engine",
+    "ScanIndex": "index",
+    "ScanCheckpoint": "checkpoint",
+    "ScanMetrics": "metrics",
+    "ScanRules": "rules",
+    "DuplicateFinder": "duplicates",
+    "DuplicateGroup": "duplicates",
+    "find_duplicates": "duplicates",
+    "ExtensionBreakdown": "breakdown",
+    "LargestItems": "largest",
+    "MultiRootScanner": "scheduler",
+    "QuickEstimator": "estimate",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
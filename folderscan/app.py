@@ -0,0 +1,1028 @@
+import argparse
+import itertools
+import os
+import threading
+import time
+from tkinter import *
+from tkinter import ttk
+from tkinter import filedialog
+from tkinter import messagebox
+from pathlib import Path
+from .engine import FolderResult, FolderScanner, ScanCancelled, folder_size
+from .checkpoint import ScanCheckpoint
+from .index import ScanIndex
+from .metrics import ScanMetrics
+from .rules import ScanRules
+from .pump import ScanPump
+from .progress import BACKENDS, make_progress
+from .store import ResultStore
+from .scheduler import MultiRootScanner
+from .duplicates import DuplicateFinder
+from .breakdown import ExtensionBreakdown
+from .treemap import layout
+from .search import SearchIndex
+from .largest import LargestItems
+from .estimate import QuickEstimator
+from .snapshot import diff_snapshots, load_snapshot, save_snapshot
+from . import watch
+
+WATCH_INTERVAL_MS = 1000  # Cada cuánto se aplican los cambios vigilados
+DUPLICATES_POLL_MS = 200  # Cada cuánto se mira si ha terminado la búsqueda de duplicados
+SORT_ARROWS = {False: " ▲", True: " ▼"}
+PLACEHOLDER = "placeholder::"  # Prefijo del hijo ficticio que muestra el desplegable de una carpeta sin cargar
+LARGEST_N = 50  # Elementos de cada lista del panel de los más grandes
+LARGEST_REFRESH_S = 0.5  # Cada cuánto se redibuja ese panel durante el escaneo
+SEARCH_DELAY_MS = 150  # Espera tras la última tecla antes de filtrar
+TREEMAP_BATCH = 2000  # Rectángulos del mapa que se dibujan en cada tanda
+TREEMAP_MIN_SIZE = 6  # Píxeles por lado a partir de los que se reparte el interior de una carpeta
+TREEMAP_HEADER = 14  # Altura reservada para el nombre de cada carpeta
+ESTIMATE_SECONDS = 3.0  # Tiempo de muestreo de la estimación rápida
+ESTIMATE_POLL_MS = 250  # Cada cuánto se redibujan las estimaciones mientras se muestrea
+ESTIMATE_PREFIX = "estimate::"  # Prefijo de las filas con el tamaño estimado de una carpeta de primer nivel
+ROOTS_NAME = "Carpetas seleccionadas"  # Raíz ficticia que reúne las carpetas de un escaneo de varias
+TREEMAP_COLORS = ("#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3", "#fdb462", "#b3de69", "#fccde5")
+
+class FolderAnalyzerApp:
+    def __init__(self, root, progress="ttk"):
+        self.root = root
+        self.root.title("Analizador de Carpetas")
+        self.root.geometry("800x600")
+        self.root.configure(bg="#f0f0f0")
+
+        self.style = ttk.Style()
+        self.style.configure("TButton", padding=6, relief="flat", background="#003366", foreground="black", font=("Arial", 10))
+        self.style.map("TButton", background=[("active", "#002244")])
+        self.style.configure("TLabel", background="#f0f0f0", foreground="black")
+        self.style.configure("Treeview.Heading", background="#4CAF50", foreground="black", font=("Arial", 10, "bold"))
+        self.style.configure("Treeview", rowheight=25)
+
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=BOTH, expand=1, padx=10, pady=10)
+        self.main_frame = Frame(self.notebook, bg="#f0f0f0")
+        self.notebook.add(self.main_frame, text="Carpetas")
+        self.types_frame = Frame(self.notebook, bg="#f0f0f0")
+        self.notebook.add(self.types_frame, text="Tipos de fichero")
+        self.largest_frame = Frame(self.notebook, bg="#f0f0f0")
+        self.notebook.add(self.largest_frame, text="Más grandes")
+
+        self.canvas = Canvas(self.main_frame, bg="#f0f0f0", highlightthickness=0)
+        self.scrollbar = Scrollbar(self.main_frame, orient=VERTICAL, command=self.canvas.yview)
+        self.scrollable_frame = Frame(self.canvas, bg="#f0f0f0")
+
+        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas_window = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.tag_bind("treemap", "<Button-1>", self.on_treemap_click)
+        self.canvas.bind("<Button-3>", self.on_treemap_back)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.button_frame = Frame(self.root, bg="#f0f0f0")
+        self.button_frame.pack(fill=X, pady=5, padx=10)
+
+        self.select_button = ttk.Button(self.button_frame, text="Seleccionar Carpeta", command=self.select_folder)
+        self.select_button.pack(side=LEFT, padx=5)
+
+        self.add_button = ttk.Button(self.button_frame, text="Añadir Carpeta", command=self.add_folder)
+        self.add_button.pack(side=LEFT, padx=5)
+
+        self.scan_button = ttk.Button(self.button_frame, text="Escanear Carpetas", command=self.start_scan_thread)
+        self.scan_button.pack(side=LEFT, padx=5)
+
+        self.pause_button = ttk.Button(self.button_frame, text="Pausar", command=self.toggle_pause)
+        self.pause_button.pack(side=LEFT, padx=5)
+        self.pause_button.state(["disabled"])
+
+        self.cancel_button = ttk.Button(self.button_frame, text="Cancelar", command=self.cancel_scan)
+        self.cancel_button.pack(side=LEFT, padx=5)
+        self.cancel_button.state(["disabled"])
+
+        self.sort_name_button = ttk.Button(self.button_frame, text="Ordenar por Nombre", command=self.sort_by_name)
+        self.sort_name_button.pack(side=LEFT, padx=5)
+
+        self.sort_size_button = ttk.Button(self.button_frame, text="Ordenar por Tamaño", command=self.sort_by_size)
+        self.sort_size_button.pack(side=LEFT, padx=5)
+
+        self.workers_label = ttk.Label(self.button_frame, text="Hilos:")
+        self.workers_label.pack(side=LEFT, padx=(10, 0))
+        self.workers_var = IntVar(value=1)
+        self.workers_spinbox = ttk.Spinbox(self.button_frame, from_=1, to=64, width=4, textvariable=self.workers_var)
+        self.workers_spinbox.pack(side=LEFT, padx=5)
+
+        self.watch_var = BooleanVar(value=False)
+        self.watch_check = ttk.Checkbutton(self.button_frame, text="Vigilar cambios", variable=self.watch_var)
+        self.watch_check.pack(side=LEFT, padx=5)
+        if not watch.available():
+            self.watch_check.state(["disabled"])
+
+        self.tree_mode_var = BooleanVar(value=False)
+        self.tree_mode_check = ttk.Checkbutton(self.button_frame, text="Vista de árbol", variable=self.tree_mode_var, command=self.show_results)
+        self.tree_mode_check.pack(side=LEFT, padx=5)
+
+        self.map_mode_var = BooleanVar(value=False)
+        self.map_mode_check = ttk.Checkbutton(self.button_frame, text="Mapa", variable=self.map_mode_var,
+                                              command=self.toggle_map)
+        self.map_mode_check.pack(side=LEFT, padx=5)
+
+        self.rules_frame = Frame(self.root, bg="#f0f0f0")
+        self.rules_frame.pack(fill=X, pady=(0, 5), padx=10)
+
+        self.exclude_label = ttk.Label(self.rules_frame, text="Excluir (separado por comas):")
+        self.exclude_label.pack(side=LEFT, padx=5)
+        self.exclude_var = StringVar(value="")
+        self.exclude_entry = ttk.Entry(self.rules_frame, textvariable=self.exclude_var, width=30)
+        self.exclude_entry.pack(side=LEFT, padx=5)
+
+        self.depth_label = ttk.Label(self.rules_frame, text="Profundidad máx. (0 = sin límite):")
+        self.depth_label.pack(side=LEFT, padx=(10, 0))
+        self.depth_var = IntVar(value=0)
+        self.depth_spinbox = ttk.Spinbox(self.rules_frame, from_=0, to=999, width=4, textvariable=self.depth_var)
+        self.depth_spinbox.pack(side=LEFT, padx=5)
+
+        self.one_fs_var = BooleanVar(value=False)
+        self.one_fs_check = ttk.Checkbutton(self.rules_frame, text="Un solo sistema de ficheros", variable=self.one_fs_var)
+        self.one_fs_check.pack(side=LEFT, padx=5)
+
+        # El índice no ve los ficheros que crecen sin tocar su carpeta: esto lo relee todo y lo pone al día
+        self.full_scan_var = BooleanVar(value=False)
+        self.full_scan_check = ttk.Checkbutton(self.rules_frame, text="Escaneo completo", variable=self.full_scan_var)
+        self.full_scan_check.pack(side=LEFT, padx=5)
+
+        self.duplicates_var = BooleanVar(value=False)
+        self.duplicates_check = ttk.Checkbutton(self.rules_frame, text="Buscar duplicados", variable=self.duplicates_var)
+        self.duplicates_check.pack(side=LEFT, padx=5)
+
+        self.breakdown_var = BooleanVar(value=False)
+        self.breakdown_check = ttk.Checkbutton(self.rules_frame, text="Desglose por extensión", variable=self.breakdown_var)
+        self.breakdown_check.pack(side=LEFT, padx=5)
+
+        self.largest_files_var = BooleanVar(value=False)
+        self.largest_files_check = ttk.Checkbutton(self.rules_frame, text="Ficheros más grandes",
+                                                   variable=self.largest_files_var)
+        self.largest_files_check.pack(side=LEFT, padx=5)
+
+        self.estimate_var = BooleanVar(value=False)
+        self.estimate_check = ttk.Checkbutton(self.rules_frame, text="Estimación rápida", variable=self.estimate_var)
+        self.estimate_check.pack(side=LEFT, padx=5)
+        self.refine_var = BooleanVar(value=True)
+        self.refine_check = ttk.Checkbutton(self.rules_frame, text="Afinar después", variable=self.refine_var)
+        self.refine_check.pack(side=LEFT, padx=5)
+
+        self.search_frame = Frame(self.root, bg="#f0f0f0")
+        self.search_frame.pack(fill=X, pady=(0, 5), padx=10)
+        self.search_label = ttk.Label(self.search_frame, text="Buscar (texto o patrón con * ?):")
+        self.search_label.pack(side=LEFT, padx=5)
+        self.search_var = StringVar(value="")
+        self.search_var.trace_add("write", self.on_search_changed)
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, width=40)
+        self.search_entry.pack(side=LEFT, padx=5)
+        self.search_count_label = ttk.Label(self.search_frame, text="")
+        self.search_count_label.pack(side=LEFT, padx=5)
+
+        self.tree = ttk.Treeview(self.scrollable_frame, columns=("Ruta", "Tamaño"), show="headings")
+        self.heading_texts = {"Ruta": "Ruta de la Carpeta", "Tamaño": "Tamaño (bytes)", "#0": "Carpeta"}
+        self.tree.heading("Ruta", text="Ruta de la Carpeta", command=lambda: self.toggle_sort("name"))
+        self.tree.heading("Tamaño", text="Tamaño (bytes)", command=lambda: self.toggle_sort("size"))
+        self.tree.column("Ruta", width=500)
+        self.tree.column("Tamaño", width=200)
+        self.tree.heading("#0", text="Carpeta", command=lambda: self.toggle_sort("name"))
+        self.tree.column("#0", width=500)
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.tree.pack(fill=BOTH, expand=1, padx=10, pady=10)
+
+        self.types_top = Frame(self.types_frame, bg="#f0f0f0")
+        self.types_top.pack(fill=X, padx=10, pady=(10, 0))
+        self.types_label = ttk.Label(self.types_top,
+                                     text="Activa «Desglose por extensión» y escanea para ver la composición")
+        self.types_label.pack(side=LEFT)
+        self.by_category_var = BooleanVar(value=False)
+        self.by_category_check = ttk.Checkbutton(self.types_top, text="Agrupar por tipo", variable=self.by_category_var,
+                                                 command=self.show_breakdown)
+        self.by_category_check.pack(side=RIGHT)
+        self.types_tree = ttk.Treeview(self.types_frame, columns=("Extensión", "Tipo", "Tamaño", "Ficheros"),
+                                       show="headings")
+        for column, text, width in (("Extensión", "Extensión", 200), ("Tipo", "Tipo", 150),
+                                    ("Tamaño", "Tamaño (bytes)", 200), ("Ficheros", "Ficheros", 120)):
+            self.types_tree.heading(column, text=text)
+            self.types_tree.column(column, width=width)
+        self.types_tree.pack(fill=BOTH, expand=1, padx=10, pady=10)
+
+        self.largest_trees = {}
+        for kind, text in (("carpeta", "Carpetas más grandes"), ("fichero", "Ficheros más grandes")):
+            frame = LabelFrame(self.largest_frame, text=text, bg="#f0f0f0")
+            frame.pack(side=LEFT, fill=BOTH, expand=1, padx=5, pady=5)
+            tree = ttk.Treeview(frame, columns=("Ruta", "Tamaño"), show="headings")
+            tree.heading("Ruta", text="Ruta")
+            tree.heading("Tamaño", text="Tamaño (bytes)")
+            tree.column("Ruta", width=300)
+            tree.column("Tamaño", width=110)
+            tree.pack(fill=BOTH, expand=1, padx=5, pady=5)
+            self.largest_trees[kind] = tree
+
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.canvas.pack(side=LEFT, fill=BOTH, expand=1)
+
+        self.progress = make_progress(progress, self.root)
+
+        self.status_frame = LabelFrame(self.root, text="Estado del escaneo", bg="#f0f0f0")
+        self.status_frame.pack(fill=X, padx=10, pady=(0, 10))
+        self.status_label = ttk.Label(self.status_frame, text="Sin datos", wraplength=620, justify=LEFT)
+        self.status_label.pack(side=LEFT, padx=10, pady=5)
+        self.export_button = ttk.Button(self.status_frame, text="Exportar métricas", command=self.export_metrics)
+        self.export_button.pack(side=RIGHT, padx=5, pady=5)
+        self.diff_button = ttk.Button(self.status_frame, text="Comparar con instantánea", command=self.compare_snapshot)
+        self.diff_button.pack(side=RIGHT, padx=5, pady=5)
+        self.snapshot_button = ttk.Button(self.status_frame, text="Guardar instantánea", command=self.save_snapshot)
+        self.snapshot_button.pack(side=RIGHT, padx=5, pady=5)
+        self.open_button = ttk.Button(self.status_frame, text="Abrir instantánea", command=self.open_snapshot)
+        self.open_button.pack(side=RIGHT, padx=5, pady=5)
+
+        self.selected_folder_frame = LabelFrame(self.root, text="Carpeta Seleccionada", bg="#f0f0f0")
+        self.selected_folder_frame.pack(fill=X, padx=10, pady=(0, 10))
+        self.folder_label = ttk.Label(self.selected_folder_frame, text="Carpeta seleccionada: Ninguna")
+        self.folder_label.pack(padx=10, pady=5)
+
+        self.folders = ResultStore("")
+        self.selected_folders = []  # Con varias se escanean a la vez, agrupadas por dispositivo
+        self.scan_workers = 1
+        self.index = ScanIndex()
+        self.checkpoint = ScanCheckpoint()
+        self.scanner = None
+        self.metrics = None
+        self.scan_rules = None
+        self.scan_reuse_index = True  # Se lee en el hilo de la interfaz al empezar cada escaneo
+        self.finder = None
+        self.breakdown = None
+        self.largest = LargestItems(LARGEST_N)
+        self.largest_shown = (None, 0.0)  # (versión, instante) de lo último dibujado en el panel
+        self.breakdown_folder = None  # Carpeta cuyo desglose se muestra en la segunda pestaña
+        self.map_root = -1  # Carpeta que llena el mapa; cambia al hacer zoom
+        self.treemap_layout = None
+        self.treemap_job = None
+        self.treemap_items = {}  # Elemento del lienzo -> índice de su carpeta
+        self.duplicates = None  # Resultado de la búsqueda en curso: (grupos, error)
+        self.duplicates_progress = None  # (etapa, hechos, total) que deja el hilo de búsqueda
+        self.watch_enabled = False
+        self.watcher = None
+        self.watch_job = None
+        self.scanned_folder = None  # Raíz de ``self.folders``: la carpeta escaneada o ``ROOTS_NAME``
+        self.scanned_roots = []  # Carpetas escaneadas, cuyas filas llevan su subtotal si hay varias
+        self.scan_pump = None
+        self.scan_results = None
+        self.tree_sort = "size"
+        self.sort_reverse = True
+        self.sort_cache = {}  # Clave -> índices en orden ascendente
+        self.search_index = None
+        self.search_matches = None  # Carpetas que deja ver el filtro, o None sin filtro
+        self.search_job = None
+        self.status_note = None  # Último error grave, que se muestra tras el resumen de las métricas
+        self.estimator = None
+        self.estimate_done = None  # Se activa cuando el hilo de muestreo termina
+        self.estimates = []  # Última estimación de las carpetas de primer nivel
+        self.estimate_rows = set()  # Carpetas que aún se muestran con su tamaño estimado
+
+    def get_folder_size(self, folder_path):
+        return folder_size(folder_path)
+
+    def select_folder(self):
+        folder = filedialog.askdirectory(title="Selecciona una carpeta", initialdir=str(Path.home()))
+        self.selected_folders = [folder] if folder else []
+        self.show_selected()
+
+    def add_folder(self):
+        folder = filedialog.askdirectory(title="Añade otra carpeta", initialdir=str(Path.home()))
+        if folder and folder not in self.selected_folders:
+            self.selected_folders.append(folder)
+        self.show_selected()
+
+    def show_selected(self):
+        if len(self.selected_folders) > 1:
+            self.folder_label.config(text=f"Carpetas seleccionadas: {', '.join(self.selected_folders)}")
+        else:
+            self.folder_label.config(text=f"Carpeta seleccionada: {''.join(self.selected_folders) or 'Ninguna'}")
+
+    def row_path(self, path):
+        """Ruta que se muestra en la lista; con varias carpetas escaneadas, las suyas son su subtotal"""
+        return f"{path} (subtotal)" if len(self.scanned_roots) > 1 and path in self.scanned_roots else path
+
+    def scan_folders(self):
+        if not self.selected_folders:
+            self.folder_label.config(text="Por favor, selecciona una carpeta primero")
+            return
+        if self.scan_pump is not None and self.scan_pump.running:
+            return  # Ya hay un escaneo en marcha
+
+        self.clear_rows()
+        self.show_estimates(self.estimates)  # Siguen a la vista hasta que llegue el tamaño exacto
+
+        roots = list(self.selected_folders)
+        multiple = len(roots) > 1
+        self.sort_cache = {}
+        self.search_index = None
+        self.search_matches = None
+        self.clear_treemap()
+        # La vigilancia sigue una sola carpeta
+        self.scan_results = [] if self.watch_enabled and not multiple else None
+
+        self.progress.start()
+
+        self.metrics = ScanMetrics()
+        self.status_note = None
+        self.finder = DuplicateFinder(workers=self.scan_workers) if self.duplicates_var.get() else None
+        self.breakdown = ExtensionBreakdown() if self.breakdown_var.get() else None
+        self.largest = LargestItems(LARGEST_N)
+        self.breakdown_folder = None  # Todas las carpetas escaneadas
+        on_file = self.on_file()
+        if multiple and (self.watch_enabled or self.estimate_var.get()):
+            self.status_note = "con varias carpetas no se vigilan cambios ni se hace la estimación rápida"
+
+        # Un escaneo que mira los ficheros no puede continuar otro: se deja el punto de control para otra vez
+        interrupted = [root for root in roots if on_file is None and self.checkpoint.exists(root)]
+        if interrupted and not messagebox.askyesno(
+                "Escaneo interrumpido", f"Hay un escaneo sin terminar de {', '.join(interrupted)}. "
+                                        f"¿Continuar desde donde se quedó?"):
+            for root in interrupted:
+                self.checkpoint.discard(root)
+
+        # Los errores no se imprimen: se cuentan por tipo en el panel de estado y en las métricas
+        options = dict(onerror=lambda error: None, workers=self.scan_workers, index=self.index,
+                       checkpoint=self.checkpoint, metrics=self.metrics, rules=self.scan_rules, on_file=on_file,
+                       reuse_index=self.scan_reuse_index)
+        if multiple:
+            # Varias carpetas a la vez, un hilo por dispositivo, reunidas en una sola vista
+            self.scanner = scanner = MultiRootScanner(roots, **options)
+            self.scanned_roots = scanner.roots
+            self.folders = ResultStore(ROOTS_NAME, scanner.roots)
+        else:
+            self.scanner = scanner = FolderScanner(roots[0], **options)
+            self.scanned_roots = [scanner.root]
+            self.folders = ResultStore(scanner.root)
+        self.scanned_folder = self.folders.root
+        self.pause_button.state(["!disabled"])
+        self.cancel_button.state(["!disabled"])
+        self.scan_pump = ScanPump(scanner.scan(), self.root.after,
+                                  on_batch=self.on_scan_batch, on_done=self.on_scan_done,
+                                  estimate=scanner.estimate_total)
+        self.scan_pump.start()
+
+    def on_file(self):
+        """Callback por fichero para el escaneo, o ``None`` si no hace falta ver los ficheros"""
+        collectors = [c.collect for c in (self.finder, self.breakdown) if c is not None]
+        if self.largest_files_var.get():
+            collectors.append(self.largest.collect)
+        if len(collectors) > 1:
+            return lambda entry, st: [callback(entry, st) for callback in collectors]
+        return collectors[0] if collectors else None
+
+    def on_scan_batch(self, results, scanned, total):
+        with self.metrics.phase("interfaz"):
+            self.show_batch(results, total)
+        self.show_status()
+
+    def show_batch(self, results, total):
+        if self.scan_results is not None:
+            self.scan_results.extend(results)
+        tree_mode = self.tree_mode_var.get()
+        for result in results:
+            if result.path in self.estimate_rows:
+                self.estimate_rows.discard(result.path)
+                self.tree.delete(ESTIMATE_PREFIX + result.path)
+            if result.path not in self.scanned_roots:
+                self.largest.add_folder(result)
+            index = self.folders.add(result)
+            if index != self.folders.root_index and not tree_mode:
+                self.tree.insert("", "end", iid=index, values=(self.row_path(result.path), result.size))
+        self.sort_cache = {}
+        if time.monotonic() - self.largest_shown[1] >= LARGEST_REFRESH_S:
+            self.show_largest()
+        scanned = len(self.folders)
+        self.progress.update(scanned, max(total - 1, scanned) if total is not None else None)
+
+    def on_scan_done(self, error):
+        with self.metrics.phase("interfaz"):
+            self.finish_scan(error)
+        self.show_status()
+
+    def show_status(self):
+        text = self.metrics.summary()
+        if self.status_note:
+            text += f" · {self.status_note}"
+        self.status_label.config(text=text)
+
+    def report_error(self, message, error):
+        """Muestra un error en el panel de estado y lo cuenta en las métricas, que lo incluyen al exportarlas"""
+        self.status_note = message
+        if self.metrics is None:
+            self.status_label.config(text=message)
+            return
+        self.metrics.error(error)
+        self.show_status()
+
+    def finish_scan(self, error):
+        self.show_largest()
+        self.pause_button.config(text="Pausar")
+        self.pause_button.state(["disabled"])
+        self.cancel_button.state(["disabled"])
+        if isinstance(error, ScanCancelled):
+            # Solo el recorrido en serie sin ``on_file`` guarda puntos de control
+            if self.scanner.checkpoint is None:
+                note = "con duplicados, desglose o ficheros más grandes no se guarda dónde se quedó"
+            elif any(self.checkpoint.exists(root) for root in self.scanned_roots):
+                note = "se puede continuar más tarde"
+            else:
+                note = "con más de un hilo no se guarda dónde se quedó: no se puede continuar"
+            self.folder_label.config(text=f"Escaneo cancelado: {', '.join(self.scanned_roots)} ({note})")
+        elif error is not None:
+            self.report_error(f"Error al escanear {', '.join(self.scanned_roots)}: {error}", error)
+        else:
+            if len(self.scanned_roots) > 1:
+                self.folder_label.config(text=f"{len(self.scanned_roots)} carpetas: "
+                                              f"{self.folders.sizes[self.folders.root_index]} bytes en total")
+            for path in self.estimate_rows:
+                self.tree.delete(ESTIMATE_PREFIX + path)
+            self.estimate_rows = set()
+            if self.tree_mode_var.get():
+                self.show_results()
+            self.show_breakdown()
+            self.search_index = SearchIndex(self.folders)
+            if self.search_var.get().strip():
+                self.apply_filter()
+            if self.map_mode_var.get():
+                self.map_root = self.folders.root_index
+                self.draw_treemap()
+            if self.scan_results is not None:
+                self.start_watch(self.scanned_folder, self.scan_results)
+        self.scan_results = None
+        self.progress.finish()
+        if error is None and self.finder is not None:
+            self.find_duplicates()
+
+    def find_duplicates(self):
+        """Hashea los candidatos en otro hilo para no bloquear la interfaz"""
+        finder, self.duplicates, self.duplicates_progress = self.finder, None, None
+
+        def run():
+            try:
+                self.duplicates = (finder.find(lambda error: None, self.report_duplicates_progress), None)
+            except Exception as e:
+                self.duplicates = (None, e)
+
+        self.scan_button.state(["disabled"])
+        self.progress.start()
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(DUPLICATES_POLL_MS, self.poll_duplicates)
+
+    def report_duplicates_progress(self, stage, done, total):
+        self.duplicates_progress = (stage, done, total)
+
+    def poll_duplicates(self):
+        if self.duplicates is None:
+            if self.duplicates_progress is not None:
+                stage, done, total = self.duplicates_progress
+                step = "bloques inicial y final" if stage == 2 else "contenido completo"
+                self.progress.update(done, total, f"Duplicados ({step})", approximate=False)
+            self.root.after(DUPLICATES_POLL_MS, self.poll_duplicates)
+            return
+        groups, error = self.duplicates
+        self.duplicates, self.finder = None, None
+        self.scan_button.state(["!disabled"])
+        self.progress.finish()
+        if error is not None:
+            self.report_error(f"Error al buscar duplicados: {error}", error)
+            return
+        self.show_duplicates(groups)
+
+    def show_duplicates(self, groups):
+        window = Toplevel(self.root)
+        reclaimable = sum(group.reclaimable for group in groups)
+        window.title(f"Duplicados en {', '.join(self.scanned_roots)}: {len(groups)} grupos, {reclaimable} bytes recuperables")
+        window.geometry("800x400")
+        tree = ttk.Treeview(window, columns=("Tamaño", "Recuperable"))
+        tree.heading("#0", text="Copias")
+        tree.column("#0", width=500)
+        tree.heading("Tamaño", text="Tamaño (bytes)")
+        tree.column("Tamaño", width=130)
+        tree.heading("Recuperable", text="Recuperable (bytes)")
+        tree.column("Recuperable", width=130)
+        for group in groups:
+            item = tree.insert("", "end", text=f"{len(group.paths)} copias", values=(group.size, group.reclaimable))
+            for path in group.paths:
+                tree.insert(item, "end", text=path, values=(group.size, ""))
+        tree.pack(fill=BOTH, expand=1, padx=10, pady=10)
+        return tree
+
+    def start_scan_thread(self):
+        try:
+            self.scan_workers = self.workers_var.get()
+        except TclError:
+            self.scan_workers = 1
+        try:
+            max_depth = self.depth_var.get() or None
+        except TclError:
+            max_depth = None
+        self.scan_reuse_index = not self.full_scan_var.get()
+        self.scan_rules = ScanRules(exclude=self.exclude_var.get().split(","), max_depth=max_depth,
+                                    one_filesystem=self.one_fs_var.get())
+        self.stop_watch()
+        self.watch_enabled = self.watch_var.get()
+        self.estimates = []
+        if self.estimate_var.get() and len(self.selected_folders) == 1:
+            self.start_estimate()
+        else:
+            self.scan_folders()
+
+    def start_estimate(self):
+        """Muestrea el árbol unos segundos en otro hilo y, si se pide, sigue con el escaneo exacto"""
+        if not self.selected_folders:
+            self.folder_label.config(text="Por favor, selecciona una carpeta primero")
+            return
+        if self.estimator is not None or (self.scan_pump is not None and self.scan_pump.running):
+            return
+        self.clear_rows()
+        folder = self.selected_folders[0]
+        self.folders = ResultStore(folder)
+        self.sort_cache = {}
+        self.search_index = None
+        self.search_matches = None
+        self.clear_treemap()
+        self.estimator = estimator = QuickEstimator(folder, onerror=lambda error: None,
+                                                    rules=self.scan_rules)
+        self.estimate_done = done = threading.Event()
+
+        def run():
+            try:
+                estimator.run(ESTIMATE_SECONDS)
+            finally:
+                done.set()
+
+        self.scan_button.state(["disabled"])
+        self.cancel_button.state(["!disabled"])
+        self.progress.start()
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(ESTIMATE_POLL_MS, self.poll_estimate)
+
+    def poll_estimate(self):
+        estimator = self.estimator
+        self.estimates = estimator.estimates()
+        self.show_estimates(self.estimates)
+        total = estimator.total(self.estimates)
+        self.folder_label.config(text=f"Estimación de {estimator.root}: ≈{total.size} bytes "
+                                      f"(entre {total.low} y {total.high} con un 95 % de confianza)")
+        self.progress.update(estimator.folders_read, text="Estimación, carpetas leídas")
+        if not self.estimate_done.is_set():
+            self.root.after(ESTIMATE_POLL_MS, self.poll_estimate)
+            return
+        self.estimator = None
+        self.progress.finish()
+        self.scan_button.state(["!disabled"])
+        if self.refine_var.get() and not estimator.cancelled:
+            self.scan_folders()
+        else:
+            self.cancel_button.state(["disabled"])
+
+    def show_estimates(self, estimates):
+        """Muestra o actualiza las filas estimadas, de mayor a menor, antes de las exactas"""
+        tree = self.tree
+        for position, estimate in enumerate(estimates):
+            item = ESTIMATE_PREFIX + estimate.path
+            if estimate.exact:
+                size = str(estimate.size)
+            elif estimate.probes > 1 and estimate.size and estimate.high > estimate.low:
+                size = f"≈{estimate.size} (±{(estimate.high - estimate.low) * 50 // estimate.size} %)"
+            elif estimate.probes:
+                size = f"≈{estimate.size}"  # Un solo sondeo: extrapolado pero aún sin margen
+            else:
+                size = f"≥{estimate.size}"  # Aún sin sondeos suficientes: solo se sabe lo ya leído
+            values = (f"{estimate.path} (estimación)", size)
+            if tree.exists(item):
+                tree.item(item, values=values)
+                tree.move(item, "", position)
+            else:
+                tree.insert("", position, iid=item, text=os.path.basename(estimate.path), values=values)
+        self.estimate_rows = {estimate.path for estimate in estimates}
+
+    def export_metrics(self):
+        if self.metrics is None:
+            return
+        path = filedialog.asksaveasfilename(title="Exportar métricas", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json"), ("Prometheus", "*.prom")])
+        if path:
+            self.metrics.save(path)
+
+    def scan_finished(self):
+        return self.folders.root_index >= 0 and not (self.scan_pump is not None and self.scan_pump.running)
+
+    def save_snapshot(self):
+        if not self.scan_finished():
+            self.folder_label.config(text="No hay un escaneo completo que guardar")
+            return
+        if self.folders.roots is not None:
+            self.folder_label.config(text="Las instantáneas admiten una sola carpeta")
+            return
+        path = filedialog.asksaveasfilename(title="Guardar instantánea", defaultextension=".snap",
+                                            filetypes=[("Instantánea", "*.snap")])
+        if path:
+            # Una instantánea abierta conserva la fecha de su escaneo
+            scanned_ns = int(self.metrics.started * 1e9) if self.metrics is not None else self.folders.scanned_ns
+            save_snapshot(self.folders, path, scanned_ns)
+
+    def open_snapshot(self):
+        """Muestra una instantánea guardada como si fuera el resultado de un escaneo"""
+        if self.scan_pump is not None and self.scan_pump.running:
+            return
+        path = filedialog.askopenfilename(title="Abrir instantánea", filetypes=[("Instantánea", "*.snap")])
+        if not path:
+            return
+        start = time.perf_counter()
+        try:
+            store = load_snapshot(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Instantánea no válida", str(e))
+            return
+        self.stop_watch()
+        self.clear_rows()
+        self.folders = store
+        self.scanned_folder = self.breakdown_folder = store.root
+        self.scanned_roots = [store.root]
+        self.sort_cache = {}
+        self.search_index = None  # Se construye con la primera búsqueda
+        self.search_matches = None
+        self.metrics = self.finder = self.breakdown = None
+        self.types_tree.delete(*self.types_tree.get_children())
+        self.types_label.config(text="Las instantáneas no guardan el desglose por extensión")
+        self.clear_treemap()
+        # En árbol solo se leen del fichero las carpetas que se despliegan
+        self.tree_mode_var.set(True)
+        self.show_results()
+        self.largest = LargestItems(LARGEST_N)
+        for index in store.largest(LARGEST_N):
+            self.largest.add_folder(FolderResult(store.path(index), store.sizes[index], store.files[index], 0,
+                                                 store.mtimes[index]))
+        self.show_largest()
+        if self.map_mode_var.get():
+            self.map_root = store.root_index
+            self.draw_treemap()
+        scanned = time.strftime("%Y-%m-%d %H:%M", time.localtime(store.scanned_ns / 1e9)) if store.scanned_ns else "?"
+        self.folder_label.config(text=f"Instantánea de {store.root} (escaneada el {scanned})")
+        self.status_label.config(text=f"{len(store)} carpetas abiertas en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def compare_snapshot(self):
+        if not self.scan_finished():
+            self.folder_label.config(text="Escanea la carpeta antes de compararla")
+            return
+        if self.folders.roots is not None:
+            self.folder_label.config(text="Las instantáneas admiten una sola carpeta")
+            return
+        path = filedialog.askopenfilename(title="Comparar con instantánea", filetypes=[("Instantánea", "*.snap")])
+        if not path:
+            return
+        try:
+            old = load_snapshot(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Instantánea no válida", str(e))
+            return
+        self.show_changes(old.root, diff_snapshots(old, self.folders))
+
+    def show_changes(self, old_root, changes):
+        window = Toplevel(self.root)
+        window.title(f"Cambios desde la instantánea de {old_root}")
+        window.geometry("800x400")
+        tree = ttk.Treeview(window, columns=("Ruta", "Antes", "Ahora", "Cambio", "Estado"), show="headings")
+        for column, text, width in (("Ruta", "Ruta de la Carpeta", 380), ("Antes", "Antes (bytes)", 110),
+                                    ("Ahora", "Ahora (bytes)", 110), ("Cambio", "Cambio (bytes)", 110),
+                                    ("Estado", "Estado", 80)):
+            tree.heading(column, text=text)
+            tree.column(column, width=width)
+        for change in changes:
+            tree.insert("", "end", values=(change.path, change.old_size, change.new_size, f"{change.delta:+d}",
+                                           change.status))
+        tree.pack(fill=BOTH, expand=1, padx=10, pady=10)
+        return tree
+
+    def show_largest(self):
+        """Redibuja el panel de los más grandes si han cambiado desde la última vez"""
+        version = self.largest.version
+        if version != self.largest_shown[0]:
+            for kind, items in (("carpeta", self.largest.folders()), ("fichero", self.largest.files())):
+                tree = self.largest_trees[kind]
+                tree.delete(*tree.get_children())
+                for item in items:
+                    tree.insert("", "end", values=(item.path, item.size))
+        self.largest_shown = (version, time.monotonic())
+
+    def on_tree_select(self, event):
+        item = self.tree.focus()
+        if self.breakdown is None or not item.isdigit():
+            return
+        self.breakdown_folder = self.folders.path(int(item))
+        self.show_breakdown()
+
+    def show_breakdown(self):
+        """Muestra en la segunda pestaña la composición de la carpeta elegida y sus subcarpetas"""
+        if self.breakdown is None or not self.scan_finished():
+            return
+        for item in self.types_tree.get_children():
+            self.types_tree.delete(item)
+        folders = self.scanned_roots if self.breakdown_folder is None else [self.breakdown_folder]
+        rows = self.breakdown.combined(folders, by_category=self.by_category_var.get())
+        total = sum(row.size for row in rows)
+        self.types_label.config(text=f"Composición de {', '.join(folders)}: {total} bytes")
+        if self.by_category_var.get():
+            self.types_tree.configure(displaycolumns=("Tipo", "Tamaño", "Ficheros"))
+        else:
+            self.types_tree.configure(displaycolumns=("Extensión", "Tipo", "Tamaño", "Ficheros"))
+        for row in rows:
+            self.types_tree.insert("", "end", values=(row.key, row.category, row.size, row.files))
+
+    def toggle_map(self):
+        # El mapa se dibuja en el mismo lienzo que contiene la lista, que se oculta mientras tanto
+        if self.map_mode_var.get():
+            self.canvas.itemconfigure(self.canvas_window, state="hidden")
+            self.map_root = self.folders.root_index
+            self.draw_treemap()
+        else:
+            self.clear_treemap()
+            self.canvas.itemconfigure(self.canvas_window, state="normal")
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def clear_treemap(self):
+        if self.treemap_job is not None:
+            self.root.after_cancel(self.treemap_job)
+            self.treemap_job = None
+        self.treemap_layout = None
+        self.treemap_items = {}
+        self.canvas.delete("treemap")
+
+    def draw_treemap(self):
+        """Empieza a dibujar el mapa de ``map_root``; el resto lo hacen las tandas de ``draw_treemap_batch``"""
+        self.clear_treemap()
+        if not self.scan_finished() or self.map_root < 0 or not self.folders.alive(self.map_root):
+            return
+        width, height = max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1)
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+        self.treemap_layout = layout(self.folders, self.map_root, 0, 0, width, height,
+                                     min_size=TREEMAP_MIN_SIZE, pad=2, header=TREEMAP_HEADER)
+        self.folder_label.config(text=f"Mapa de {self.folders.path(self.map_root)} "
+                                      f"({self.folders.sizes[self.map_root]} bytes): clic para entrar, "
+                                      f"clic derecho para salir")
+        self.draw_treemap_batch()
+
+    def draw_treemap_batch(self):
+        drawn = 0
+        for rect in itertools.islice(self.treemap_layout, TREEMAP_BATCH):
+            drawn += 1
+            item = self.canvas.create_rectangle(rect.x, rect.y, rect.x + rect.w, rect.y + rect.h,
+                                                fill=TREEMAP_COLORS[rect.depth % len(TREEMAP_COLORS)],
+                                                outline="#555555", tags=("treemap",))
+            self.treemap_items[item] = rect.index
+            if rect.w > 40 and rect.h > TREEMAP_HEADER:
+                name = self.folders.name(rect.index)[:int(rect.w // 7)]
+                item = self.canvas.create_text(rect.x + 3, rect.y + 1, anchor="nw", text=name, font=("Arial", 8),
+                                               tags=("treemap",))
+                self.treemap_items[item] = rect.index
+        # Una tanda incompleta es la última
+        self.treemap_job = self.root.after(1, self.draw_treemap_batch) if drawn == TREEMAP_BATCH else None
+
+    def on_treemap_click(self, event):
+        items = self.canvas.find_withtag("current")
+        index = self.treemap_items.get(items[0]) if items else None
+        if index is not None and index != self.map_root:
+            self.map_root = index
+            self.draw_treemap()
+
+    def on_treemap_back(self, event):
+        if self.map_mode_var.get() and self.map_root != self.folders.root_index and self.map_root >= 0:
+            self.map_root = self.folders.parents[self.map_root]
+            self.draw_treemap()
+
+    def on_canvas_resize(self, event):
+        if self.map_mode_var.get():
+            self.draw_treemap()
+
+    def toggle_pause(self):
+        if self.scan_pump is None or not self.scan_pump.running:
+            return
+        if self.scanner.paused:
+            self.scanner.resume()
+            self.pause_button.config(text="Pausar")
+        else:
+            self.scanner.pause()
+            self.pause_button.config(text="Reanudar")
+
+    def cancel_scan(self):
+        if self.estimator is not None:
+            self.estimator.cancel()
+        elif self.scan_pump is not None and self.scan_pump.running:
+            self.scanner.cancel()
+
+    def sort_by_name(self):
+        self.apply_sort("name", False)
+
+    def sort_by_size(self):
+        self.apply_sort("size", True)
+
+    def toggle_sort(self, key):
+        if key == self.tree_sort:
+            reverse = not self.sort_reverse
+        else:
+            reverse = key == "size"
+        self.apply_sort(key, reverse)
+
+    def sorted_indices(self, key):
+        # La permutación se calcula una vez por clave; el orden inverso sale gratis
+        order = self.sort_cache.get(key)
+        if order is None:
+            order = self.folders.order_by_name() if key == "name" else self.folders.order_by_size()
+            self.sort_cache[key] = order
+        return order
+
+    def apply_sort(self, key, reverse):
+        # Reordena las filas existentes sin borrarlas ni volver a insertarlas
+        self.tree_sort, self.sort_reverse = key, reverse
+        columns = ("Ruta", "#0") if key == "name" else ("Tamaño",)
+        for column, text in self.heading_texts.items():
+            self.tree.heading(column, text=text + (SORT_ARROWS[reverse] if column in columns else ""))
+
+        if self.tree_mode_var.get():
+            pending = [""]
+            while pending:
+                item = pending.pop()
+                children = self.tree.get_children(item)
+                if not children or children[0].startswith(PLACEHOLDER):
+                    continue
+                estimated = [child for child in children if child.startswith(ESTIMATE_PREFIX)]
+                rest = [child for child in children if not child.startswith(ESTIMATE_PREFIX)]
+                self.tree.set_children(item, *estimated, *self.sort_level(rest))
+                pending.extend(children)
+        else:
+            order = self.sorted_indices(key) if self.search_matches is None else self.filtered_indices(key)
+            # Las filas que no se pasan quedan separadas del árbol, no borradas
+            estimated = [ESTIMATE_PREFIX + estimate.path for estimate in self.estimates
+                         if estimate.path in self.estimate_rows]
+            self.tree.set_children("", *estimated, *(reversed(order) if reverse else order))
+
+    def filtered_indices(self, key):
+        """Coincidencias de la búsqueda en el orden de ``key``, sin ordenar todas las carpetas"""
+        rank = self.sort_cache.get(("rank", key))
+        if rank is None:
+            rank = [0] * len(self.folders)
+            for position, index in enumerate(self.sorted_indices(key)):
+                rank[index] = position
+            self.sort_cache[("rank", key)] = rank
+        return sorted(self.search_matches, key=rank.__getitem__)
+
+    def on_search_changed(self, *args):
+        # Se espera a que se deje de escribir para no filtrar en cada tecla
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self.search_job = None
+        if not self.scan_finished():
+            return
+        query = self.search_var.get().strip()
+        if not query:
+            if self.search_matches is not None:
+                self.search_matches = None
+                self.search_count_label.config(text="")
+                if not self.tree_mode_var.get():
+                    self.apply_sort(self.tree_sort, self.sort_reverse)
+            return
+        if self.search_index is None or self.search_index.stale:
+            self.search_index = SearchIndex(self.folders)
+        if self.tree_mode_var.get():
+            # El filtro se aplica a la lista; en el árbol las coincidencias quedarían plegadas
+            self.tree_mode_var.set(False)
+            self.show_results()
+        start = time.perf_counter()
+        self.search_matches = self.search_index.search(query)
+        self.apply_sort(self.tree_sort, self.sort_reverse)
+        self.search_count_label.config(
+            text=f"{len(self.search_matches)} carpetas ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def clear_rows(self):
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.estimate_rows = set()
+        if self.search_matches is not None:
+            # Las filas que oculta el filtro siguen existiendo, separadas del árbol
+            for index in self.folders.indices():
+                if self.tree.exists(index):
+                    self.tree.delete(index)
+
+    def show_results(self):
+        self.clear_rows()
+
+        if self.tree_mode_var.get():
+            # Solo se insertan las carpetas de primer nivel; el resto al desplegar
+            self.tree.configure(show="tree headings", displaycolumns=("Tamaño",))
+            if self.folders.root_index >= 0:
+                self.populate("", self.folders.root_index)
+        else:
+            self.tree.configure(show="headings", displaycolumns=("Ruta", "Tamaño"))
+            for index in self.folders.indices():
+                self.tree.insert("", "end", iid=index,
+                                 values=(self.row_path(self.folders.path(index)), self.folders.sizes[index]))
+            if self.search_matches is not None:
+                self.apply_sort(self.tree_sort, self.sort_reverse)
+
+    def sort_level(self, items):
+        # Las filas usan como identificador el índice de la carpeta en self.folders
+        folders = self.folders
+        if self.tree_sort == "name":
+            key = lambda item: folders.name(int(item))
+        else:
+            key = lambda item: folders.sizes[int(item)]
+        return sorted(items, key=key, reverse=self.sort_reverse)
+
+    def live_children(self, index):
+        return [child for child in self.folders.children(index) if self.folders.alive(child)]
+
+    def insert_node(self, parent_item, index):
+        self.tree.insert(parent_item, "end", iid=index, text=self.folders.name(index),
+                         values=(self.folders.path(index), self.folders.sizes[index]))
+        if self.live_children(index):
+            self.tree.insert(index, "end", iid=PLACEHOLDER + str(index))
+
+    def populate(self, parent_item, index):
+        for child in self.sort_level([str(child) for child in self.live_children(index)]):
+            self.insert_node(parent_item, int(child))
+
+    def on_tree_open(self, event):
+        item = self.tree.focus()
+        placeholder = PLACEHOLDER + item
+        if self.tree.exists(placeholder):
+            self.tree.delete(placeholder)
+            self.populate(item, int(item))
+
+    def start_watch(self, folder, results):
+        try:
+            self.watcher = watch.FolderWatcher(folder, results, onerror=self.on_watch_error, rules=self.scan_rules)
+        except OSError as e:
+            self.report_error(f"Error al vigilar {folder}: {e}", e)
+            return
+        self.watch_job = self.root.after(WATCH_INTERVAL_MS, self.poll_watch)
+
+    def on_watch_error(self, error):
+        self.report_error(f"Error al vigilar {error.filename}: {error}", error)
+
+    def stop_watch(self):
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+            self.watch_job = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+    def poll_watch(self):
+        if self.watcher is None:
+            return
+        changed, removed = self.watcher.poll()
+        if changed or removed:
+            self.sort_cache = {}
+        for path in removed:
+            index = self.folders.find(path)
+            if index is None:
+                continue  # Ya se quitó junto con una carpeta padre
+            for gone in self.folders.remove(index):
+                if self.tree.exists(gone):
+                    self.tree.delete(gone)
+        # Las carpetas nuevas llegan antes que sus padres: se añaden de arriba abajo para que el padre ya esté
+        for path, size in sorted(changed.items(), key=lambda item: item[0].count(os.sep)):
+            index = self.folders.find(path)
+            if index is not None:
+                self.folders.sizes[index] = size
+                if self.tree.exists(index):
+                    self.tree.item(index, values=(path, size))
+                continue
+
+            parent = self.folders.find(os.path.dirname(path))
+            if parent is None:
+                continue
+            index = self.folders.add_child(parent, os.path.basename(path), size)
+            if not self.tree_mode_var.get():
+                self.tree.insert("", "end", iid=index, values=(path, size))
+            elif parent == self.folders.root_index:
+                self.insert_node("", index)
+            elif self.tree.exists(parent) and not self.tree.exists(PLACEHOLDER + str(parent)):
+                self.insert_node(parent, index)  # Padre ya desplegado alguna vez
+        if (changed or removed) and self.search_matches is not None:
+            self.apply_filter()
+        if self.watcher.overflowed:
+            self.folder_label.config(text="Se han perdido eventos de vigilancia: conviene volver a escanear")
+        self.watch_job = self.root.after(WATCH_INTERVAL_MS, self.poll_watch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m folderscan.app", description="Analizador de Carpetas")
+    parser.add_argument("--progress", choices=sorted(BACKENDS), default="ttk",
+                        help="Barra de progreso en la ventana (ttk) o en la consola (tqdm)")
+    args = parser.parse_args(argv)
+    root = Tk()
+    app = FolderAnalyzerApp(root, progress=args.progress)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import bisect
+import os
+import threading
+from array import array
+from typing import NamedTuple
+
+NO_EXTENSION = "(sin extensión)"
+OTHER_EXTENSIONS = "(otras)"  # Extensiones que ya no caben en la tabla
+
+CATEGORIES = {
+    "imagen": ".jpg .jpeg .png .gif .bmp .tif .tiff .webp .heic .raw .cr2 .nef .svg .ico .psd",
+    "vídeo": ".mp4 .mkv .avi .mov .wmv .flv .webm .m4v .mpg .mpeg .ts .vob",
+    "audio": ".mp3 .flac .wav .ogg .m4a .aac .wma .opus .aiff",
+    "comprimido": ".zip .rar .7z .tar .gz .tgz .bz2 .xz .zst .lz4 .iso .dmg .cab .deb .rpm .jar .whl",
+    "documento": ".pdf .doc .docx .xls .xlsx .ppt .pptx .odt .ods .odp .txt .md .rtf .csv .epub",
+    "código": ".py .c .h .cpp .hpp .cc .java .js .ts .go .rs .rb .php .cs .sh .html .css .json .xml .yml .yaml",
+    "compilado": ".o .obj .a .lib .so .dll .dylib .exe .class .pyc .pyo .pdb .wasm .elc",
+    "base de datos": ".db .sqlite .sqlite3 .mdb .accdb .dbf .ldb",
+}
+_CATEGORY_OF = {extension: category for category, extensions in CATEGORIES.items() for extension in extensions.split()}
+
+
+def category(extension):
+    """Tipo general de una extensión (``imagen``, ``comprimido``, ``compilado``...) u ``otros``"""
+    return _CATEGORY_OF.get(extension, "otros")
+
+
+class BreakdownRow(NamedTuple):
+    """Bytes y ficheros de una extensión o de un tipo"""
+    key: str  # Extensión o tipo
+    category: str
+    size: int
+    files: int
+
+
+class ExtensionBreakdown:
+    """Reparto de bytes y ficheros por extensión, para cada carpeta y para la raíz.
+
+    Se rellena durante el escaneo (``collect`` como ``on_file`` de
+    ``FolderScanner``), sin segunda pasada. Cada extensión distinta recibe un
+    número pequeño y cada carpeta guarda solo las suyas en tres ``array``
+    compactos; como mucho se distinguen ``max_extensions`` extensiones y el
+    resto se cuenta junto como ``(otras)``, así que la memoria no se dispara
+    con nombres raros. El desglose de un subárbol se suma al pedirlo.
+    """
+
+    def __init__(self, max_extensions=1024):
+        self.max_extensions = max_extensions
+        self.extensions = []  # Número -> extensión
+        self._extension_ids = {}
+        self._folders = {}  # Carpeta -> (números de extensión, bytes, ficheros) de sus propios ficheros
+        self._sorted = None  # Carpetas ordenadas para buscar subárboles por prefijo
+        self._lock = threading.Lock()
+
+    def _extension_id(self, name):
+        extension = os.path.splitext(name)[1].lower() or NO_EXTENSION
+        extension_id = self._extension_ids.get(extension)
+        if extension_id is None:
+            if len(self.extensions) >= self.max_extensions:
+                extension = OTHER_EXTENSIONS
+                extension_id = self._extension_ids.get(extension)
+            if extension_id is None:
+                extension_id = self._extension_ids[extension] = len(self.extensions)
+                self.extensions.append(extension)
+        return extension_id
+
+    def collect(self, entry, st):
+        """Cuenta un fichero del escaneo; se puede llamar desde varios hilos"""
+        folder = os.path.dirname(entry.path)
+        with self._lock:
+            extension_id = self._extension_id(entry.name)
+            counters = self._folders.get(folder)
+            if counters is None:
+                counters = self._folders[folder] = (array("H"), array("q"), array("q"))
+                self._sorted = None
+            ids, sizes, files = counters
+            try:
+                slot = ids.index(extension_id)  # Pocas extensiones por carpeta: más barato que un dict
+            except ValueError:
+                ids.append(extension_id)
+                sizes.append(st.st_size)
+                files.append(1)
+            else:
+                sizes[slot] += st.st_size
+                files[slot] += 1
+
+    def _subtree(self, folder):
+        if self._sorted is None:
+            self._sorted = sorted(self._folders)
+        prefix = os.path.join(folder, "")
+        # Las subcarpetas ocupan un tramo contiguo de la lista ordenada
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\U0010ffff")
+        return [folder] + [path for path in self._sorted[start:end] if path != folder]
+
+    def breakdown(self, folder, recursive=True, by_category=False):
+        """Filas de ``folder`` (con sus subcarpetas si ``recursive``), de más a menos bytes"""
+        if os.path.dirname(folder) != folder:
+            folder = folder.rstrip(os.sep)  # Las claves vienen de ``dirname``, sin barra final
+        totals = {}
+        with self._lock:
+            folders = self._subtree(folder) if recursive else [folder]
+            for path in folders:
+                counters = self._folders.get(path)
+                if counters is None:
+                    continue
+                for extension_id, size, files in zip(*counters):
+                    extension = self.extensions[extension_id]
+                    key = category(extension) if by_category else extension
+                    total = totals.setdefault(key, [0, 0])
+                    total[0] += size
+                    total[1] += files
+        rows = [BreakdownRow(key, key if by_category else category(key), size, files)
+                for key, (size, files) in totals.items()]
+        rows.sort(key=lambda row: row.size, reverse=True)
+        return rows
+
+    def combined(self, folders, by_category=False):
+        """Desglose de varias carpetas juntas (p. ej. las raíces de ``MultiRootScanner``)"""
+        totals = {}
+        for folder in folders:
+            for row in self.breakdown(folder, by_category=by_category):
+                total = totals.get(row.key)
+                totals[row.key] = row if total is None else total._replace(size=total.size + row.size,
+                                                                           files=total.files + row.files)
+        return sorted(totals.values(), key=lambda row: row.size, reverse=True)
@@ -0,0 +1,99 @@
+import json
+import os
+import time
+
+from .index import cache_dir
+
+
+class ScanCheckpoint:
+    """Puntos de control en SQLite para continuar un escaneo interrumpido.
+
+    Por cada carpeta raíz se guarda el estado del recorrido (la frontera de
+    carpetas pendientes de leer y los totales parciales de las carpetas abiertas)
+    y los resultados de las carpetas ya terminadas. Los resultados se añaden en
+    cada punto de control, así que guardar no cuesta más cuanto más avanza el
+    escaneo.
+
+    Igual que ``ScanIndex``, cada operación abre su propia conexión.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "checkpoints.sqlite3")
+
+    def _connect(self):
+        import sqlite3  # Como en ``ScanIndex``, solo al usarlo
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                root TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                saved_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_results (
+                root TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                files INTEGER NOT NULL,
+                file_bytes INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS checkpoint_results_root ON checkpoint_results (root);
+        """)
+        return conn
+
+    @staticmethod
+    def _key(root):
+        return os.path.realpath(root)
+
+    def exists(self, root):
+        """Indica si hay un escaneo interrumpido de ``root`` que se puede continuar"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT 1 FROM checkpoints WHERE root = ?", (self._key(root),)).fetchone() is not None
+        finally:
+            conn.close()
+
+    def load(self, root):
+        """Devuelve ``(estado, resultados)`` del último punto de control o ``None``.
+
+        ``resultados`` son tuplas ``(ruta, tamaño, ficheros, bytes, mtime_ns)`` en
+        el orden en que se entregaron.
+        """
+        key = self._key(root)
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT state FROM checkpoints WHERE root = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            results = conn.execute(
+                "SELECT path, size, files, file_bytes, mtime_ns FROM checkpoint_results WHERE root = ? ORDER BY rowid",
+                (key,)).fetchall()
+            return json.loads(row[0]), results
+        finally:
+            conn.close()
+
+    def save(self, root, state, results):
+        """Sustituye el estado guardado y añade los resultados terminados desde el anterior"""
+        key = self._key(root)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+                             (key, json.dumps(state), time.time_ns()))
+                conn.executemany("INSERT INTO checkpoint_results VALUES (?, ?, ?, ?, ?, ?)",
+                                 ((key,) + tuple(result) for result in results))
+        finally:
+            conn.close()
+
+    def discard(self, root):
+        """Borra el punto de control de ``root`` (p. ej. al terminar el escaneo)"""
+        key = self._key(root)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM checkpoints WHERE root = ?", (key,))
+                conn.execute("DELETE FROM checkpoint_results WHERE root = ?", (key,))
+        finally:
+            conn.close()
@@ -0,0 +1,277 @@
+"""Escaneo sin interfaz gráfica: ``python -m folderscan CARPETA``.
+
+Los resultados se escriben en cuanto termina cada carpeta (JSONL o CSV), sin
+acumularlos en memoria, así que la salida se puede encadenar con otras
+herramientas mientras el escaneo sigue en marcha.
+
+Las instantáneas (que cargan ``numpy``) y la búsqueda de duplicados se
+importan solo si se piden, para que un escaneo simple arranque enseguida.
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import signal
+import sys
+import time
+
+from .breakdown import BreakdownRow, ExtensionBreakdown
+from .checkpoint import ScanCheckpoint
+from .engine import FolderResult, FolderScanner, ScanCancelled
+from .index import ScanIndex
+from .largest import LargestItem, LargestItems
+from .metrics import ScanMetrics
+from .rules import ScanRules
+from .scheduler import MultiRootScanner
+
+
+def _print_error(error):
+    print(f"Error al escanear {error.filename}: {error}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m folderscan",
+                                     description="Calcula el tamaño de cada carpeta de un árbol.")
+    parser.add_argument("folder", nargs="*",
+                        help="Carpeta a escanear; si se dan varias se escanean a la vez, agrupadas por dispositivo")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="Formato de salida")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Hilos para leer carpetas en paralelo")
+    parser.add_argument("--device-workers", action="append", default=[], metavar="RUTA=N",
+                        help="Hilos para el dispositivo de RUTA (p. ej. 1 para un disco duro, 16 para un NFS) "
+                             "en lugar de --workers; se puede repetir")
+    parser.add_argument("--index", action="store_true", help="Usar el índice en disco para reescaneos incrementales")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Guardar puntos de control y continuar el escaneo interrumpido de la carpeta, si lo hay "
+                             "(solo con un hilo: un escaneo con --workers mayor que 1 no se puede continuar)")
+    parser.add_argument("-e", "--exclude", action="append", default=[], metavar="PATRÓN",
+                        help="Excluir carpetas que encajen (sintaxis de .gitignore); se puede repetir")
+    parser.add_argument("-i", "--include", action="append", default=[], metavar="PATRÓN",
+                        help="Volver a incluir carpetas excluidas por otro patrón; se puede repetir")
+    parser.add_argument("--exclude-from", metavar="FICHERO", help="Leer patrones de exclusión de un fichero")
+    parser.add_argument("-d", "--max-depth", type=int, help="No bajar más de N niveles por debajo de la carpeta")
+    parser.add_argument("-x", "--one-file-system", action="store_true",
+                        help="No entrar en carpetas de otro sistema de ficheros (montajes)")
+    parser.add_argument("--snapshot", metavar="FICHERO", help="Guardar una instantánea del escaneo para compararla después")
+    parser.add_argument("--diff", nargs="+", metavar="INSTANTÁNEA",
+                        help="Listar lo que ha cambiado desde la instantánea VIEJA, comparada con el escaneo de "
+                             "la carpeta o con una segunda instantánea NUEVA")
+    parser.add_argument("--min-delta", type=int, default=1, metavar="BYTES",
+                        help="Con --diff, omitir las carpetas que cambian menos de estos bytes")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="Listar grupos de ficheros duplicados en lugar del tamaño de cada carpeta")
+    parser.add_argument("--min-size", type=int, default=1, metavar="BYTES",
+                        help="Con --duplicates, ignorar los ficheros más pequeños")
+    parser.add_argument("--by-extension", action="store_true",
+                        help="Listar bytes y ficheros por extensión en lugar del tamaño de cada carpeta")
+    parser.add_argument("--by-type", action="store_true",
+                        help="Como --by-extension, pero agrupando por tipo (imagen, comprimido, compilado...)")
+    parser.add_argument("--top", type=int, metavar="N",
+                        help="Listar los N ficheros y las N carpetas más grandes en lugar de todas las carpetas")
+    parser.add_argument("--estimate", type=float, metavar="SEGUNDOS",
+                        help="Estimar por muestreo durante estos segundos el tamaño de las carpetas de primer nivel, "
+                             "con su intervalo de confianza del 95 %%, en lugar de escanearlo todo")
+    parser.add_argument("--metrics", metavar="FICHERO",
+                        help="Guardar las métricas del escaneo (Prometheus si acaba en .prom, si no JSON)")
+    return parser
+
+
+def write_jsonl(results, out):
+    for result in results:
+        out.write(json.dumps(result._asdict(), ensure_ascii=False))
+        out.write("\n")
+
+
+def write_csv(results, out, fields=FolderResult._fields):
+    if hasattr(out, "reconfigure"):
+        out.reconfigure(newline="")  # csv ya escribe sus propios finales de línea
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    for result in results:
+        writer.writerow(result)
+
+
+def collect(results, store):
+    """Entrega los resultados tal cual y a la vez los guarda en ``store``"""
+    for result in results:
+        store.add(result)
+        yield result
+
+
+def collect_largest(results, largest, roots):
+    """Entrega los resultados tal cual y a la vez lleva la cuenta de las carpetas más grandes (sin las raíces)"""
+    for result in results:
+        if result.path not in roots:
+            largest.add_folder(result)
+        yield result
+
+
+def parse_device_workers(values, parser):
+    device_workers = {}
+    for value in values:
+        path, _, count = value.rpartition("=")
+        if not path or not count.isdigit() or int(count) < 1:
+            parser.error(f"--device-workers espera RUTA=N con N mayor que 0: {value}")
+        device_workers[path] = int(count)
+    return device_workers
+
+
+def print_subtotals(scanner):
+    """Escribe en stderr el subtotal de cada raíz y los hilos de su dispositivo"""
+    for device, roots in scanner.devices.items():
+        for root in roots:
+            total = scanner.totals.get(root)
+            size = f"{total.size} bytes" if total is not None else "sin terminar"
+            workers = scanner.limits[device]
+            print(f"{root}: {size} (dispositivo {device}, {workers} {'hilo' if workers == 1 else 'hilos'})",
+                  file=sys.stderr)
+
+
+def write_rows(rows, fields, args):
+    if args.format == "csv":
+        write_csv(rows, sys.stdout, fields)
+    else:
+        write_jsonl(rows, sys.stdout)
+    sys.stdout.flush()
+
+
+def write_diff(old_path, new, args):
+    from .snapshot import SnapshotChange, diff_snapshots, load_snapshot
+
+    write_rows(diff_snapshots(load_snapshot(old_path), new, args.min_delta), SnapshotChange._fields, args)
+
+
+def write_duplicates(groups, args):
+    if args.format == "csv":
+        write_csv(((n, group.size, group.reclaimable, path) for n, group in enumerate(groups, 1)
+                   for path in group.paths), sys.stdout, ("group", "size", "reclaimable", "path"))
+    else:
+        for group in groups:
+            sys.stdout.write(json.dumps({"size": group.size, "reclaimable": group.reclaimable,
+                                         "paths": list(group.paths)}, ensure_ascii=False))
+            sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def write_estimate(folder, rules, args):
+    from .estimate import QuickEstimator, SizeEstimate
+
+    estimator = QuickEstimator(folder, onerror=_print_error, rules=rules)
+    estimator.run(args.estimate)
+    rows = estimator.estimates()
+    write_rows(rows + [estimator.total(rows)], SizeEstimate._fields, args)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.diff and len(args.diff) > 2:
+        parser.error("--diff admite una o dos instantáneas")
+    by_extension = args.by_extension or args.by_type
+    if args.diff and (args.duplicates or by_extension or args.top):
+        parser.error("--diff no se puede combinar con --duplicates, --by-extension ni --top")
+    if args.checkpoint and (args.duplicates or by_extension or args.top):
+        # Necesitan ver todos los ficheros, así que no pueden continuar un escaneo a medias
+        parser.error("--checkpoint no se puede combinar con --duplicates, --by-extension ni --top")
+    if args.diff and len(args.diff) == 2:
+        from .snapshot import load_snapshot
+
+        write_diff(args.diff[0], load_snapshot(args.diff[1]), args)
+        return 0
+    if not args.folder:
+        parser.error("falta la carpeta a escanear")
+    multiple = len(args.folder) > 1 or bool(args.device_workers)
+    if multiple and (args.snapshot or args.diff):
+        parser.error("--snapshot y --diff admiten una sola carpeta")
+    device_workers = parse_device_workers(args.device_workers, parser)
+    for folder in args.folder:
+        if not os.path.isdir(folder):
+            print(f"No es una carpeta: {folder}", file=sys.stderr)
+            return 2
+    exclude = list(args.exclude)
+    if args.exclude_from:
+        with open(args.exclude_from, encoding="utf-8") as f:
+            exclude = f.read().splitlines() + exclude
+    rules = ScanRules(exclude, args.include, args.max_depth, args.one_file_system)
+    if args.estimate is not None:
+        if multiple or args.snapshot or args.diff or args.duplicates or by_extension or args.top or args.checkpoint:
+            parser.error("--estimate admite una sola carpeta y no se combina con otros listados")
+        return write_estimate(args.folder[0], rules, args)
+    finder = None
+    if args.duplicates:
+        from .duplicates import DuplicateFinder
+
+        finder = DuplicateFinder(args.min_size, args.workers)
+    breakdown = ExtensionBreakdown() if by_extension else None
+    largest = LargestItems(args.top) if args.top else None
+    collectors = [c.collect for c in (finder, breakdown, largest) if c is not None]
+    if len(collectors) > 1:
+        on_file = lambda entry, st: [callback(entry, st) for callback in collectors]
+    else:
+        on_file = collectors[0] if collectors else None
+    options = dict(onerror=_print_error, workers=args.workers, index=ScanIndex() if args.index else None,
+                   checkpoint=ScanCheckpoint() if args.checkpoint else None,
+                   metrics=ScanMetrics() if args.metrics else None, rules=rules, on_file=on_file)
+    if multiple:
+        scanner = MultiRootScanner(args.folder, device_workers=device_workers, **options)
+        roots = scanner.roots
+    else:
+        scanner = FolderScanner(args.folder[0], **options)
+        roots = [scanner.root]
+    write = write_csv if args.format == "csv" else write_jsonl
+    results = scanner.scan()
+    store = None
+    if args.snapshot or args.diff:
+        from .snapshot import save_snapshot
+        from .store import ResultStore
+
+        store = ResultStore(scanner.root)
+        results = collect(results, store)
+    if largest is not None:
+        results = collect_largest(results, largest, set(roots))
+    if on_file is not None or args.diff:
+        # Solo se escribe la comparación, los duplicados, el desglose o los más grandes
+        write = lambda results, out: collections.deque(results, maxlen=0)
+
+    def interrupt(signum, frame):
+        # El primer Ctrl+C cancela entre dos carpetas con el punto de control al día; el segundo corta ya
+        scanner.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, interrupt)
+    try:
+        try:
+            started_ns = time.time_ns()
+            write(results, sys.stdout)
+            sys.stdout.flush()
+            if args.snapshot:
+                save_snapshot(store, args.snapshot, started_ns)
+            if args.diff:
+                write_diff(args.diff[0], store, args)
+            if multiple:
+                print_subtotals(scanner)
+            if breakdown is not None:
+                write_rows(breakdown.combined(roots, args.by_type), BreakdownRow._fields, args)
+            if largest is not None:
+                write_rows(largest.files() + largest.folders(), LargestItem._fields, args)
+            if finder is not None:
+                write_duplicates(finder.find(_print_error), args)
+        finally:
+            if args.metrics:
+                scanner.metrics.save(args.metrics)
+    except ScanCancelled:
+        sys.stdout.flush()
+        if args.checkpoint:
+            # Solo el recorrido en serie guarda puntos de control
+            if any(options["checkpoint"].exists(root) for root in roots):
+                print("Escaneo cancelado; se puede continuar con --checkpoint", file=sys.stderr)
+            else:
+                print("Escaneo cancelado; con más de un hilo no se guardan puntos de control y no se puede continuar",
+                      file=sys.stderr)
+        return 130
+    except BrokenPipeError:
+        # El lector ha cerrado la tubería (p. ej. ``| head``): no es un error
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
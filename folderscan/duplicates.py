@@ -0,0 +1,140 @@
+import hashlib
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+BLOCK_SIZE = 64 * 1024  # Bytes del principio y del final que se comparan primero
+READ_SIZE = 1 << 20  # Lecturas con buffer para ficheros que no se pueden proyectar en memoria
+MMAP_MIN_SIZE = 8 << 20  # A partir de este tamaño se hashea con mmap, sin copiar a Python
+
+
+class DuplicateGroup(NamedTuple):
+    """Ficheros con el mismo contenido"""
+    size: int  # Tamaño de cada copia
+    paths: tuple
+
+    @property
+    def reclaimable(self):
+        """Bytes que se liberarían dejando una sola copia"""
+        return self.size * (len(self.paths) - 1)
+
+
+def _partial_hash(path, size, block_size):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(block_size))
+        if size > block_size:
+            f.seek(max(block_size, size - block_size))
+            digest.update(f.read(block_size))
+    return digest.digest()
+
+
+def _full_hash(path, size):
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        if size >= MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)  # hashlib suelta el GIL con buffers grandes
+                return digest.digest()
+            except (OSError, ValueError):
+                f.seek(0)  # Sistemas de ficheros sin mmap: lectura normal
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class DuplicateFinder:
+    """Busca ficheros duplicados en tres etapas para leer lo mínimo posible.
+
+    Los ficheros se recogen durante el escaneo normal (``collect`` como
+    ``on_file`` de ``FolderScanner``) y se agrupan por tamaño; solo los
+    tamaños repetidos pasan a la segunda etapa, que hashea el primer y el
+    último bloque de cada candidato. Únicamente los que siguen coincidiendo se
+    leen enteros. Las lecturas se reparten en ``workers`` hilos. Los enlaces
+    duros al mismo fichero cuentan como uno solo, porque borrarlos no libera
+    espacio, y los enlaces simbólicos se ignoran.
+    """
+
+    def __init__(self, min_size=1, workers=4, block_size=BLOCK_SIZE):
+        self.min_size = min_size
+        self.workers = max(1, int(workers))
+        self.block_size = block_size
+        self._by_size = {}  # Tamaño -> {(dispositivo, inodo) o ruta: ruta}
+        self._lock = threading.Lock()
+        self.files = 0
+        self.hashed_bytes = 0  # Bytes leídos para hashear, para comparar con el total
+
+    def collect(self, entry, st):
+        """Registra un fichero del escaneo; se puede llamar desde varios hilos"""
+        size = st.st_size
+        if size < self.min_size or entry.is_symlink():
+            return
+        if not st.st_ino:
+            # En Windows ``DirEntry.stat()`` no trae el inodo y hace falta un ``stat`` completo
+            try:
+                st = os.stat(entry.path)
+            except OSError:
+                pass
+        key = (st.st_dev, st.st_ino) if st.st_ino else entry.path  # Sin inodo no se reconocen los enlaces duros
+        with self._lock:
+            self.files += 1
+            self._by_size.setdefault(size, {}).setdefault(key, entry.path)
+
+    def _stage(self, groups, key, onerror, progress, stage):
+        """Reparte ``key(ruta, tamaño)`` entre los hilos y reagrupa por su resultado"""
+        jobs = [(size, path) for size, paths in groups for path in paths]
+        done = 0
+        regrouped = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = [(size, path, pool.submit(key, path, size)) for size, path in jobs]
+            for size, path, future in futures:
+                try:
+                    regrouped.setdefault((size, future.result()), []).append(path)
+                except OSError as e:
+                    onerror(e)
+                done += 1
+                if progress is not None:
+                    progress(stage, done, len(jobs))
+        return [(size, paths) for (size, _), paths in regrouped.items() if len(paths) > 1]
+
+    def find(self, onerror=None, progress=None):
+        """Devuelve los grupos de duplicados, de más a menos bytes recuperables.
+
+        ``progress(etapa, hechos, total)`` se llama tras cada fichero hasheado
+        (etapa 2: bloques parciales, etapa 3: contenido completo).
+        """
+        onerror = onerror if onerror is not None else (lambda error: None)
+        candidates = [(size, list(paths.values())) for size, paths in self._by_size.items() if len(paths) > 1]
+        block = self.block_size
+
+        def partial(path, size):
+            with self._lock:
+                self.hashed_bytes += min(size, 2 * block)
+            return _partial_hash(path, size, block)
+
+        def full(path, size):
+            with self._lock:
+                self.hashed_bytes += size
+            return _full_hash(path, size)
+
+        candidates = self._stage(candidates, partial, onerror, progress, 2)
+        # Si los dos bloques cubren todo el fichero, el hash parcial ya es el completo
+        small = [(size, paths) for size, paths in candidates if size <= 2 * block]
+        large = [(size, paths) for size, paths in candidates if size > 2 * block]
+        groups = small + self._stage(large, full, onerror, progress, 3)
+        groups = [DuplicateGroup(size, tuple(sorted(paths))) for size, paths in groups]
+        groups.sort(key=lambda group: group.reclaimable, reverse=True)
+        return groups
+
+
+def find_duplicates(root, onerror=None, workers=4, min_size=1, rules=None):
+    """Escanea ``root`` y devuelve sus grupos de ficheros duplicados"""
+    from .engine import FolderScanner
+
+    finder = DuplicateFinder(min_size, workers)
+    for _ in FolderScanner(root, onerror, workers, rules=rules, on_file=finder.collect).scan():
+        pass
+    return finder.find(onerror)
@@ -0,0 +1,428 @@
+import os
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+from .index import IndexedFolder
+
+
+class FolderResult(NamedTuple):
+    """Resultado de una carpeta ya escaneada"""
+    path: str
+    size: int  # Bytes de toda la subcarpeta
+    files: int  # Ficheros directos de la carpeta
+    file_bytes: int  # Bytes de los ficheros directos
+    mtime_ns: int  # Fecha de modificación de la carpeta
+
+
+class ScanCancelled(Exception):
+    """El escaneo se ha cancelado antes de terminar"""
+
+
+class _Frame:
+    """Carpeta leída cuyo subárbol todavía no ha terminado"""
+    __slots__ = ("path", "parent", "depth", "size", "files", "file_bytes", "pending", "folders",
+                 "mtime_ns", "ino", "subdirs")
+
+    def __init__(self, path, parent):
+        self.path = path
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.size = 0
+        self.files = 0
+        self.file_bytes = 0
+        self.pending = 0  # Subcarpetas que faltan por terminar
+        self.folders = 1  # Carpetas del subárbol ya terminadas, incluida esta
+        self.mtime_ns = 0
+        self.ino = 0
+        self.subdirs = None  # Solo se guardan si hay que actualizar el índice
+
+
+def _print_error(error):
+    print(f"Error al escanear {error.filename}: {error}")
+
+
+def scan_dir(path, onerror=_print_error, on_file=None):
+    """Lee una carpeta con ``os.scandir`` y devuelve ``(subcarpetas, nº de ficheros, bytes)``
+
+    Se aprovecha la información de ``DirEntry``: en Linux el tipo de entrada
+    viene de ``d_type`` sin llamar a ``stat``, y ``entry.path`` ya está construido,
+    así que solo se hace un ``stat`` por fichero para conocer su tamaño.
+    ``on_file(entry, stat)``, si se da, se llama con cada fichero.
+    """
+    subdirs = []
+    files = 0
+    size = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        size += st.st_size
+                        files += 1
+                        if on_file is not None:
+                            on_file(entry, st)
+                except OSError as e:
+                    onerror(e)
+    except OSError as e:
+        onerror(e)
+    return subdirs, files, size
+
+
+class FolderScanner:
+    """Recorre un árbol de carpetas una sola vez y acumula los tamaños hacia arriba.
+
+    Cada carpeta y cada fichero se visitan exactamente una vez. El recorrido es
+    en profundidad con una pila explícita: una carpeta se da por terminada
+    cuando terminan todas sus subcarpetas, y en ese momento suma su total al
+    de su padre.
+
+    Con ``workers`` mayor que 1 las carpetas se leen en paralelo desde una cola
+    compartida, lo que aprovecha la latencia de sistemas de ficheros en red
+    (NFS, SMB). Los tamaños son idénticos a los del recorrido en serie; solo
+    cambia el orden en que se entregan las carpetas.
+
+    Con un ``index`` (``ScanIndex``) las carpetas cuyo ``mtime`` no ha cambiado
+    desde el último escaneo completo no se vuelven a leer, y al terminar se
+    actualiza el índice. Con ``reuse_index=False`` se leen todas las carpetas
+    pero el índice se guarda igual, lo que recoge los ficheros que han crecido
+    sin cambiar el ``mtime`` de su carpeta.
+
+    El escaneo se puede pausar, reanudar y cancelar desde otro hilo con
+    ``pause``, ``resume`` y ``cancel``; la cancelación se comprueba antes de
+    leer cada carpeta y hace que ``scan`` lance ``ScanCancelled``. Con un
+    ``checkpoint`` (``ScanCheckpoint``) el recorrido en serie guarda su estado
+    cada ``checkpoint_interval`` segundos, al pausar y al cancelar, y un
+    escaneo posterior de la misma raíz continúa desde ahí (siempre en serie).
+
+    Con ``metrics`` (``ScanMetrics``) se registran los tiempos de lectura, las
+    llamadas a ``scandir``/``stat``, los errores y las carpetas más lentas.
+
+    Con ``rules`` (``ScanRules``) las subcarpetas excluidas por patrón, las que
+    pasan de la profundidad máxima y las de otro sistema de ficheros no se
+    recorren ni se suman.
+
+    ``on_file(entry, stat)`` recibe cada fichero visitado (desde los hilos de
+    lectura si ``workers`` es mayor que 1). Como necesita ver todos los
+    ficheros, con ``on_file`` no se aprovecha el índice ni se guardan ni se
+    continúan puntos de control (el de un escaneo anterior queda intacto).
+    """
+
+    def __init__(self, root, onerror=None, workers=1, index=None, checkpoint=None, checkpoint_interval=30.0,
+                 metrics=None, rules=None, on_file=None, reuse_index=True):
+        self.root = os.fspath(root)
+        self.on_file = on_file
+        self.rules = rules if rules else None
+        self.onerror = onerror if onerror is not None else _print_error
+        self.metrics = metrics
+        if metrics is not None:
+            report = self.onerror
+
+            def onerror(error):
+                metrics.error(error)
+                report(error)
+            self.onerror = onerror
+        self.workers = max(1, int(workers))
+        self.index = index
+        self.reuse_index = reuse_index
+        self.checkpoint = checkpoint if on_file is None else None
+        self.checkpoint_interval = checkpoint_interval
+        self.resumed = False  # Si el último escaneo ha continuado uno interrumpido
+        self._cache = {}
+        self._records = None
+        self._unsaved = None  # Resultados entregados desde el último punto de control
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+        self.folders_read = 0  # Carpetas ya leídas
+        self.folders_found = 0  # Carpetas descubiertas (leídas o pendientes)
+        self.expected_folders = None  # Carpetas del escaneo anterior, si se conoce
+        # Por profundidad: carpetas pendientes de leer, subárboles terminados y sus carpetas
+        self._unread_at = []
+        self._done_at = []
+        self._done_folders_at = []
+
+    def scan(self):
+        """Genera un ``FolderResult`` por carpeta a medida que se completa su subárbol.
+
+        Las subcarpetas se entregan antes que sus padres; la raíz es la última.
+        Los enlaces simbólicos a carpetas no se siguen.
+        """
+        started_ns = time.time_ns()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start()
+        self.folders_read, self.folders_found = 0, 1
+        self._unread_at, self._done_at, self._done_folders_at = [1], [0], [0]
+        saved = self.checkpoint.load(self.root) if self.checkpoint is not None else None
+        self.resumed = saved is not None
+        if self.index is not None:
+            start = time.perf_counter()
+            self.expected_folders = self.index.folder_count(self.root)
+            self._cache = self.index.load(self.root) if self.reuse_index else {}
+            # Un escaneo continuado no ha visto todas las carpetas: no se guarda en el índice
+            self._records = {} if saved is None else None
+            if metrics is not None:
+                metrics.add_phase("índice", time.perf_counter() - start)
+        try:
+            if saved is not None:
+                state, done = saved
+                started_ns = state["started_ns"]
+                yield from (FolderResult(*row) for row in done)
+                yield from self._scan_serial(self._restore(state))
+            elif self.workers > 1:
+                yield from self._scan_parallel()
+            else:
+                yield from self._scan_serial([_Frame(self.root, None)])
+            if self.checkpoint is not None:
+                self.checkpoint.discard(self.root)
+                self._unsaved = None
+            if self._records is not None:
+                start = time.perf_counter()
+                self.index.save(self.root, self._records, started_ns)
+                if metrics is not None:
+                    metrics.add_phase("índice", time.perf_counter() - start)
+        finally:
+            self._cache, self._records = {}, None
+            if metrics is not None:
+                metrics.finish()
+
+    def pause(self):
+        """Detiene el recorrido antes de la siguiente carpeta hasta llamar a ``resume``"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        """Pide que el escaneo termine lo antes posible con ``ScanCancelled``"""
+        self._cancelled.set()
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _save_checkpoint(self, stack, started_ns):
+        """Guarda la frontera del recorrido en serie y los resultados nuevos"""
+        # Carpetas abiertas (leídas pero sin terminar), cada una después de su padre
+        ids = {}
+        opened = []
+        for frame in stack:
+            chain = []
+            parent = frame.parent
+            while parent is not None and id(parent) not in ids:
+                chain.append(parent)
+                parent = parent.parent
+            for open_frame in reversed(chain):
+                ids[id(open_frame)] = len(opened)
+                opened.append([open_frame.path, ids[id(open_frame.parent)] if open_frame.parent else -1,
+                               open_frame.size, open_frame.files, open_frame.file_bytes,
+                               open_frame.pending, open_frame.folders, open_frame.mtime_ns])
+        state = {
+            "started_ns": started_ns,
+            "open": opened,
+            "stack": [[frame.path, ids[id(frame.parent)] if frame.parent else -1] for frame in stack],
+            "progress": [self.folders_read, self.folders_found, self._unread_at, self._done_at, self._done_folders_at],
+        }
+        self.checkpoint.save(self.root, state, self._unsaved)
+        self._unsaved = []
+
+    def _restore(self, state):
+        """Reconstruye la pila del recorrido en serie a partir de un punto de control"""
+        opened = []
+        for path, parent, size, files, file_bytes, pending, folders, mtime_ns in state["open"]:
+            frame = _Frame(path, opened[parent] if parent >= 0 else None)
+            frame.size, frame.files, frame.file_bytes = size, files, file_bytes
+            frame.pending, frame.folders, frame.mtime_ns = pending, folders, mtime_ns
+            opened.append(frame)
+        (self.folders_read, self.folders_found, self._unread_at, self._done_at,
+         self._done_folders_at) = state["progress"]
+        return [_Frame(path, opened[parent] if parent >= 0 else None) for path, parent in state["stack"]]
+
+    def estimate_total(self):
+        """Estima el número total de carpetas sin recorrer el árbol de antemano.
+
+        Si hay un escaneo anterior de la misma raíz se usa su recuento. Si no,
+        cada carpeta descubierta y aún sin leer se cuenta como un subárbol del
+        tamaño medio de los ya terminados a su misma profundidad (o a la más
+        cercana con datos). La estimación se afina a medida que avanza el
+        recorrido; devuelve ``None`` mientras no hay ningún subárbol terminado.
+        """
+        if self.expected_folders:
+            return max(self.expected_folders, self.folders_found)
+        done = [(depth, folders / count) for depth, (count, folders)
+                in enumerate(zip(self._done_at, self._done_folders_at)) if count]
+        if not done:
+            return None
+        estimate = self.folders_read
+        for depth, unread in enumerate(self._unread_at):
+            if unread:
+                # Media de la profundidad con datos más cercana
+                estimate += unread * min(done, key=lambda item: abs(item[0] - depth))[1]
+        return max(self.folders_found, round(estimate))
+
+    def _discovered(self, frame, subdirs):
+        """Actualiza los contadores de progreso tras leer una carpeta"""
+        self.folders_read += 1
+        self.folders_found += len(subdirs)
+        self._unread_at[frame.depth] -= 1
+        if subdirs:
+            if len(self._unread_at) == frame.depth + 1:
+                self._unread_at.append(0)
+                self._done_at.append(0)
+                self._done_folders_at.append(0)
+            self._unread_at[frame.depth + 1] += len(subdirs)
+
+    def _finish(self, frame):
+        """Da por terminada una carpeta, suma su total al padre y devuelve su resultado"""
+        self._done_at[frame.depth] += 1
+        self._done_folders_at[frame.depth] += frame.folders
+        parent = frame.parent
+        if parent is not None:
+            parent.size += frame.size
+            parent.folders += frame.folders
+            parent.pending -= 1
+        if self._records is not None:
+            self._records[frame.path] = IndexedFolder(
+                frame.mtime_ns, frame.ino, frame.files, frame.file_bytes, frame.size,
+                tuple(os.path.basename(path) for path in frame.subdirs))
+            frame.subdirs = None
+        return FolderResult(frame.path, frame.size, frame.files, frame.file_bytes, frame.mtime_ns)
+
+    def _read(self, frame):
+        """Lee la carpeta (o la toma del índice si no ha cambiado) y devuelve sus subcarpetas"""
+        path = frame.path
+        if self.metrics is not None:
+            start = time.perf_counter()
+        try:
+            st = os.stat(path)
+            frame.mtime_ns, ino = st.st_mtime_ns, st.st_ino
+        except OSError as e:
+            self.onerror(e)
+            ino = 0
+        cached = self._cache.get(path) if self.on_file is None else None
+        hit = cached is not None and cached.mtime_ns == frame.mtime_ns and cached.ino == ino
+        if hit:
+            frame.files, frame.file_bytes = cached.files, cached.file_bytes
+            subdirs = [os.path.join(path, name) for name in cached.subdirs]
+        else:
+            subdirs, frame.files, frame.file_bytes = scan_dir(path, self.onerror, self.on_file)
+        if self.metrics is not None:
+            self.metrics.folder_read(path, time.perf_counter() - start, frame.files, hit)
+        if self._records is not None:
+            frame.ino, frame.subdirs = ino, subdirs  # El índice guarda todas, sin podar
+        if self.rules is not None:
+            subdirs = self.rules.prune(self.root, subdirs, frame.depth + 1, self.onerror)
+        frame.size = frame.file_bytes
+        frame.pending = len(subdirs)
+        return subdirs
+
+    def _scan_serial(self, stack):
+        started_ns = time.time_ns()
+        if self.checkpoint is not None:
+            self._unsaved = []
+        saved_at = time.monotonic()
+        while stack:
+            if self.checkpoint is not None and (self.paused or self.cancelled
+                                                or time.monotonic() - saved_at >= self.checkpoint_interval):
+                self._save_checkpoint(stack, started_ns)
+                saved_at = time.monotonic()
+            self._running.wait()
+            if self.cancelled:
+                raise ScanCancelled(self.root)
+
+            frame = stack.pop()
+            subdirs = self._read(frame)
+            self._discovered(frame, subdirs)
+            stack.extend(_Frame(path, frame) for path in reversed(subdirs))
+
+            # Cerrar la carpeta y los antecesores que ya no esperan a nadie
+            while frame is not None and frame.pending == 0:
+                result = self._finish(frame)
+                if self._unsaved is not None:
+                    self._unsaved.append(result)
+                yield result
+                frame = frame.parent
+
+    def _scan_parallel(self):
+        # Cola LIFO: los hilos avanzan en profundidad y la frontera no se dispara
+        work = queue.LifoQueue()
+        results = queue.Queue()
+        lock = threading.Lock()  # Protege la propagación de totales hacia arriba
+        stop = threading.Event()
+        done = object()
+
+        def worker():
+            try:
+                while not stop.is_set():
+                    frame = work.get()
+                    if frame is None or stop.is_set():
+                        return
+                    while not self._running.wait(0.1):
+                        if stop.is_set():
+                            return
+                    if self.cancelled:
+                        return
+                    subdirs = self._read(frame)
+                    with lock:
+                        self._discovered(frame, subdirs)
+                    for path in subdirs:
+                        work.put(_Frame(path, frame))
+                    if subdirs:
+                        continue
+                    with lock:
+                        while frame is not None and frame.pending == 0:
+                            results.put(self._finish(frame))
+                            frame = frame.parent
+                        if frame is None:
+                            results.put(done)  # Ha terminado la raíz
+            except BaseException as e:
+                results.put(e)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        work.put(_Frame(self.root, None))
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    if self.cancelled:
+                        raise ScanCancelled(self.root)
+                    continue
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            for _ in threads:
+                work.put(None)
+            for thread in threads:
+                thread.join()
+
+
+def folder_size(root, onerror=None, workers=1, index=None, rules=None):
+    """Calcula el tamaño total de una carpeta en bytes"""
+    size = 0
+    for result in FolderScanner(root, onerror, workers, index, rules=rules).scan():
+        size = result.size
+    return size
+
+
+def folder_sizes(root, onerror=None, workers=1, index=None, rules=None):
+    """Devuelve la lista ``(ruta, tamaño)`` de todas las subcarpetas de ``root``"""
+    root = os.fspath(root)
+    return [(result.path, result.size) for result in FolderScanner(root, onerror, workers, index, rules=rules).scan()
+            if result.path != root]
@@ -0,0 +1,162 @@
+import math
+import os
+import random
+import threading
+import time
+from typing import NamedTuple
+
+from .engine import _print_error, scan_dir
+
+Z_95 = 1.96  # Cuantil de la normal para un intervalo de confianza del 95 %
+
+
+class SizeEstimate(NamedTuple):
+    """Tamaño estimado de una carpeta con su intervalo de confianza del 95 %"""
+    path: str
+    size: int
+    low: int
+    high: int  # Con menos de dos sondeos no hay dispersión que medir y es igual a ``size``
+    probes: int  # Sondeos aleatorios hechos en la carpeta
+    exact: bool  # Se han leído todas sus subcarpetas: el tamaño es el real
+
+
+class _Stats:
+    __slots__ = ("probes", "total", "squares", "seen", "exact")
+
+    def __init__(self):
+        self.probes = 0
+        self.total = 0.0
+        self.squares = 0.0
+        self.seen = 0  # Bytes de las carpetas ya leídas del subárbol: cota inferior segura
+        self.exact = None
+
+
+class QuickEstimator:
+    """Estimación rápida del tamaño de las carpetas de primer nivel por muestreo.
+
+    En lugar de recorrer el árbol entero se hacen sondeos aleatorios (el
+    estimador de Knuth para árboles de búsqueda): desde cada carpeta de primer
+    nivel se baja eligiendo al azar una subcarpeta en cada nivel, y los bytes
+    propios de cada carpeta del camino se multiplican por el producto de los
+    números de subcarpetas por los que se ha pasado. La media de los sondeos
+    es un estimador sin sesgo del tamaño del subárbol y su dispersión da el
+    intervalo de confianza, que se estrecha con cada ronda.
+
+    Cada sondeo lee solo tantas carpetas como niveles baja, y las carpetas
+    leídas se guardan, así que los subárboles pequeños acaban leídos del todo
+    y pasan a tener su tamaño exacto. La cota inferior del intervalo nunca
+    baja de los bytes ya vistos. Solo se cuentan los ficheros, como en
+    ``FolderScanner``, y ``rules`` poda igual que allí.
+    """
+
+    def __init__(self, root, onerror=None, rules=None, seed=None):
+        self.root = os.fspath(root)
+        self.onerror = onerror if onerror is not None else _print_error
+        self.rules = rules if rules else None
+        self.folders = None  # Carpetas de primer nivel, tras leer la raíz
+        self.own_bytes = 0  # Bytes de los ficheros de la propia raíz
+        self.folders_read = 0
+        self._rng = random.Random(seed)
+        self._reads = {}  # Ruta -> (subcarpetas, bytes propios)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Hace que ``run`` termine tras el sondeo en curso"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _read(self, path, depth, stats):
+        cached = self._reads.get(path)
+        if cached is None:
+            subdirs, _, size = scan_dir(path, self.onerror)
+            if self.rules is not None:
+                subdirs = self.rules.prune(self.root, subdirs, depth + 1, self.onerror)
+            cached = self._reads[path] = (subdirs, size)
+            self.folders_read += 1
+            if stats is not None:
+                stats.seen += size
+        return cached
+
+    def _probe(self, path, stats):
+        """Un sondeo desde ``path``; devuelve la estimación y si ha hecho falta leer alguna carpeta"""
+        estimate, weight, depth, read_before = 0, 1, 1, self.folders_read
+        while True:
+            subdirs, size = self._read(path, depth, stats)
+            estimate += weight * size
+            if not subdirs or self._cancelled.is_set():
+                return estimate, self.folders_read != read_before
+            weight *= len(subdirs)
+            path = self._rng.choice(subdirs)
+            depth += 1
+
+    def _exact(self, path):
+        """Tamaño real de ``path`` si ya se han leído todas sus subcarpetas, o ``None``"""
+        total, pending = 0, [path]
+        while pending:
+            cached = self._reads.get(pending.pop())
+            if cached is None:
+                return None
+            total += cached[1]
+            pending.extend(cached[0])
+        return total
+
+    def run(self, seconds=3.0):
+        """Sondea por rondas, una vez por carpeta no exacta en cada una, durante ``seconds`` segundos"""
+        deadline = time.monotonic() + seconds
+        if self.folders is None:
+            subdirs, self.own_bytes = self._read(self.root, 0, None)
+            with self._lock:
+                self._stats = {folder: _Stats() for folder in subdirs}
+                self.folders = subdirs
+        while not self._cancelled.is_set() and time.monotonic() < deadline:
+            pending = [(folder, stats) for folder, stats in self._stats.items() if stats.exact is None]
+            if not pending:
+                break
+            for folder, stats in pending:
+                if self._cancelled.is_set() or time.monotonic() >= deadline:
+                    break
+                estimate, read = self._probe(folder, stats)
+                # Un sondeo que no lee nada nuevo indica que el subárbol puede estar ya leído entero
+                exact = None if read else self._exact(folder)
+                with self._lock:
+                    stats.probes += 1
+                    stats.total += estimate
+                    stats.squares += estimate * estimate
+                    stats.exact = exact
+
+    def _estimate(self, path, stats):
+        if stats.exact is not None:
+            return SizeEstimate(path, stats.exact, stats.exact, stats.exact, stats.probes, True)
+        if not stats.probes:
+            return SizeEstimate(path, stats.seen, stats.seen, stats.seen, 0, False)
+        mean = stats.total / stats.probes
+        if stats.probes < 2:
+            size = max(round(mean), stats.seen)
+            return SizeEstimate(path, size, stats.seen, size, 1, False)
+        variance = max(stats.squares / stats.probes - mean * mean, 0.0) * stats.probes / (stats.probes - 1)
+        margin = Z_95 * math.sqrt(variance / stats.probes)
+        size = max(round(mean), stats.seen)
+        return SizeEstimate(path, size, max(round(mean - margin), stats.seen), max(round(mean + margin), size),
+                            stats.probes, False)
+
+    def estimates(self):
+        """Estimación actual de cada carpeta de primer nivel, de mayor a menor; se puede llamar durante ``run``"""
+        with self._lock:
+            rows = [self._estimate(folder, stats) for folder, stats in self._stats.items()]
+        rows.sort(key=lambda row: row.size, reverse=True)
+        return rows
+
+    def total(self, rows=None):
+        """Estimación de la raíz: sus ficheros más las carpetas de primer nivel, con los márgenes combinados"""
+        rows = self.estimates() if rows is None else rows
+        size = self.own_bytes + sum(row.size for row in rows)
+        # Los sondeos de cada carpeta son independientes: las varianzas se suman
+        above = math.sqrt(sum((row.high - row.size) ** 2 for row in rows))
+        below = math.sqrt(sum((row.size - row.low) ** 2 for row in rows))
+        return SizeEstimate(self.root, size, max(round(size - below), self.own_bytes), round(size + above),
+                            sum(row.probes for row in rows), all(row.exact for row in rows))
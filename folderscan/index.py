@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+from typing import NamedTuple
+
+# Margen para no fiarse de carpetas modificadas justo durante el escaneo anterior
+_MTIME_GRACE_NS = 2_000_000_000
+
+
+class IndexedFolder(NamedTuple):
+    """Datos guardados de una carpeta en el índice"""
+    mtime_ns: int
+    ino: int
+    files: int
+    file_bytes: int
+    size: int
+    subdirs: tuple  # Nombres de las subcarpetas directas
+
+
+def cache_dir():
+    """Devuelve la carpeta de caché del usuario para el analizador"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "folderanalyzer")
+
+
+class ScanIndex:
+    """Índice persistente en SQLite para reescaneos incrementales.
+
+    Guarda por carpeta su ``mtime``, inodo, ficheros directos, bytes directos y
+    tamaño acumulado, agrupado por carpeta raíz. Al reescanear, una carpeta cuyo
+    ``mtime`` e inodo no han cambiado no se vuelve a leer: se reutilizan sus
+    ficheros y subcarpetas guardados y solo se baja a las subcarpetas.
+
+    El ``mtime`` de una carpeta cambia al crear, borrar o renombrar entradas,
+    pero no cuando un fichero existente crece; esos cambios no se detectan hasta
+    que se toca la carpeta o se hace un escaneo con ``reuse_index=False``.
+
+    Cada operación abre su propia conexión, así que el índice se puede usar
+    desde el hilo de escaneo aunque se haya creado en el de la interfaz.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "index.sqlite3")
+
+    def _connect(self):
+        import sqlite3  # Aquí y no arriba: el motor importa este módulo y no siempre usa el índice
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS roots (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                folders INTEGER NOT NULL,
+                scanned_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS folders (
+                root_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                files INTEGER NOT NULL,
+                file_bytes INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                subdirs TEXT NOT NULL,
+                PRIMARY KEY (root_id, path)
+            ) WITHOUT ROWID;
+        """)
+        return conn
+
+    @staticmethod
+    def _key(root):
+        return os.path.realpath(root)
+
+    def _root_row(self, conn, root):
+        """Devuelve ``(id, carpetas, scanned_ns)`` de la raíz o ``None`` si no vale.
+
+        Si la raíz se ha movido o el volumen se ha vuelto a montar (cambia el
+        dispositivo o el inodo), se borra lo guardado para ella.
+        """
+        key = self._key(root)
+        row = conn.execute("SELECT id, dev, ino, folders, scanned_ns FROM roots WHERE path = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        root_id, dev, ino, folders, scanned_ns = row
+        try:
+            st = os.stat(root)
+        except OSError:
+            st = None
+        if st is None or st.st_dev != dev or st.st_ino != ino:
+            with conn:
+                conn.execute("DELETE FROM folders WHERE root_id = ?", (root_id,))
+                conn.execute("DELETE FROM roots WHERE id = ?", (root_id,))
+            return None
+        return root_id, folders, scanned_ns
+
+    def load(self, root):
+        """Devuelve un diccionario ``ruta -> IndexedFolder`` con lo guardado para ``root``"""
+        conn = self._connect()
+        try:
+            root_row = self._root_row(conn, root)
+            if root_row is None:
+                return {}
+            root_id, _, scanned_ns = root_row
+            limit = scanned_ns - _MTIME_GRACE_NS
+            # Las rutas se guardan relativas a la raíz real; se devuelven como la raíz pedida
+            prefix = os.fspath(root)
+            cached = {}
+            for rel, mtime_ns, ino, files, file_bytes, size, subdirs in conn.execute(
+                    "SELECT path, mtime_ns, ino, files, file_bytes, size, subdirs FROM folders WHERE root_id = ?",
+                    (root_id,)):
+                if mtime_ns >= limit:
+                    continue  # Modificada durante el escaneo anterior: hay que releerla
+                path = os.path.join(prefix, rel) if rel else prefix
+                cached[path] = IndexedFolder(mtime_ns, ino, files, file_bytes, size,
+                                             tuple(subdirs.split("\0")) if subdirs else ())
+            return cached
+        finally:
+            conn.close()
+
+    def folder_count(self, root):
+        """Número de carpetas del último escaneo completo de ``root`` o ``None``"""
+        conn = self._connect()
+        try:
+            root_row = self._root_row(conn, root)
+            return root_row[1] if root_row else None
+        finally:
+            conn.close()
+
+    def save(self, root, folders, scanned_ns=None):
+        """Sustituye lo guardado para ``root`` por ``folders`` (``ruta -> IndexedFolder``)"""
+        st = os.stat(root)
+        prefix = os.fspath(root)
+        cut = len(os.path.join(prefix, ""))
+        scanned_ns = scanned_ns if scanned_ns is not None else time.time_ns()
+        conn = self._connect()
+        try:
+            with conn:
+                key = self._key(root)
+                conn.execute("DELETE FROM folders WHERE root_id IN (SELECT id FROM roots WHERE path = ?)", (key,))
+                conn.execute("DELETE FROM roots WHERE path = ?", (key,))
+                root_id = conn.execute(
+                    "INSERT INTO roots (path, dev, ino, folders, scanned_ns) VALUES (?, ?, ?, ?, ?)",
+                    (key, st.st_dev, st.st_ino, len(folders), scanned_ns)).lastrowid
+                conn.executemany(
+                    "INSERT INTO folders VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((root_id, path[cut:] if path != prefix else "", f.mtime_ns, f.ino, f.files,
+                      f.file_bytes, f.size, "\0".join(f.subdirs))
+                     for path, f in folders.items()))
+        finally:
+            conn.close()
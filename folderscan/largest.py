@@ -0,0 +1,62 @@
+import heapq
+import threading
+from typing import NamedTuple
+
+
+class LargestItem(NamedTuple):
+    kind: str  # "fichero" o "carpeta"
+    path: str
+    size: int
+
+
+class LargestItems:
+    """Los ``n`` ficheros y las ``n`` carpetas más grandes vistos hasta ahora.
+
+    Se rellena mientras el escaneo avanza: ``collect`` como ``on_file`` de
+    ``FolderScanner`` para los ficheros y ``add_folder`` con cada
+    ``FolderResult`` para las carpetas, cuyo tamaño ya es definitivo al
+    entregarse. Cada lista es un montículo de mínimos de ``n`` elementos, así
+    que la memoria no crece con el árbol y casi todos los ficheros se
+    descartan con una sola comparación. La raíz no cuenta como carpeta.
+    """
+
+    def __init__(self, n=50):
+        self.n = n
+        self._files = []  # Montículos de (tamaño, ruta)
+        self._folders = []
+        self._lock = threading.Lock()
+        self.version = 0  # Cambia cuando cambia alguna de las listas, para no redibujar en balde
+
+    def _push(self, heap, size, path):
+        if len(heap) < self.n:
+            heapq.heappush(heap, (size, path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, path))
+        else:
+            return
+        self.version += 1
+
+    def collect(self, entry, st):
+        """Tiene en cuenta un fichero del escaneo; se puede llamar desde varios hilos"""
+        size = st.st_size
+        files = self._files
+        # Sin cerrojo primero: el umbral solo sube, así que si ya no llega no llegará
+        if len(files) >= self.n and size <= files[0][0]:
+            return
+        with self._lock:
+            self._push(files, size, entry.path)
+
+    def add_folder(self, result, root=None):
+        if result.path != root:
+            with self._lock:
+                self._push(self._folders, result.size, result.path)
+
+    def files(self):
+        """Ficheros más grandes, de mayor a menor"""
+        with self._lock:
+            return [LargestItem("fichero", path, size) for size, path in sorted(self._files, reverse=True)]
+
+    def folders(self):
+        """Carpetas más grandes, de mayor a menor"""
+        with self._lock:
+            return [LargestItem("carpeta", path, size) for size, path in sorted(self._folders, reverse=True)]
@@ -0,0 +1,165 @@
+import collections
+import heapq
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ScanMetrics:
+    """Contadores y tiempos de un escaneo para saber dónde se va el tiempo.
+
+    ``FolderScanner`` registra el tiempo de lectura de cada carpeta (en
+    paralelo es la suma de todos los hilos), las carpetas y ficheros visitados,
+    las llamadas a ``scandir`` y ``stat``, los errores por tipo y las carpetas
+    más lentas. La interfaz puede añadir sus propias fases con ``phase``, p. ej.
+    el tiempo de insertar filas, para comparar E/S con interfaz.
+
+    Se puede exportar como JSON (``to_json``) o en el formato de texto de
+    Prometheus (``to_prometheus``). Es seguro usarlo desde varios hilos.
+
+    ``start`` y ``finish`` se pueden anidar: ``MultiRootScanner`` los llama
+    alrededor de todo el escaneo y los ``FolderScanner`` de cada raíz, que
+    comparten las métricas, solo cuentan dentro de esa llamada externa.
+    """
+
+    def __init__(self, slowest=10, recent_errors=20):
+        self._lock = threading.Lock()
+        self._slowest_n = slowest
+        self.phases = collections.Counter()  # Fase -> segundos
+        self.folders = 0
+        self.cached_folders = 0  # Tomadas del índice sin leerlas
+        self.files = 0
+        self.scandir_calls = 0
+        self.stat_calls = 0
+        self.errors = collections.Counter()  # Tipo de error -> veces
+        self.recent_errors = collections.deque(maxlen=recent_errors)
+        self._slowest = []  # Montículo de (segundos, ruta) con las más lentas
+        self.started = None
+        self.finished = None
+        self._running = 0  # Llamadas a ``start`` sin su ``finish``
+
+    def start(self):
+        with self._lock:
+            self._running += 1
+            if self._running == 1:
+                self.started, self.finished = time.time(), None
+                self._start_perf = time.perf_counter()
+
+    def finish(self):
+        with self._lock:
+            if not self._running:
+                return
+            self._running -= 1
+            if not self._running:
+                self.finished = time.time()
+                self.phases["total"] += time.perf_counter() - self._start_perf
+
+    def add_phase(self, name, seconds):
+        with self._lock:
+            self.phases[name] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Suma a la fase ``name`` el tiempo del bloque ``with``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def folder_read(self, path, seconds, files, cached):
+        """Registra la lectura de una carpeta (un ``stat`` propio más uno por fichero si se leyó)"""
+        with self._lock:
+            self.phases["lectura"] += seconds
+            self.folders += 1
+            self.files += files
+            if cached:
+                self.cached_folders += 1
+                self.stat_calls += 1
+            else:
+                self.scandir_calls += 1
+                self.stat_calls += 1 + files
+            if len(self._slowest) < self._slowest_n:
+                heapq.heappush(self._slowest, (seconds, path))
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, path))
+
+    def error(self, error):
+        with self._lock:
+            self.errors[type(error).__name__] += 1
+            self.recent_errors.append(f"{getattr(error, 'filename', '')}: {error}")
+
+    def slowest(self):
+        """Carpetas más lentas de leer como ``(segundos, ruta)``, de más a menos lenta"""
+        with self._lock:
+            return sorted(self._slowest, reverse=True)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "finished": self.finished,
+                "phases": dict(self.phases),
+                "folders": self.folders,
+                "cached_folders": self.cached_folders,
+                "files": self.files,
+                "scandir_calls": self.scandir_calls,
+                "stat_calls": self.stat_calls,
+                "errors": dict(self.errors),
+                "recent_errors": list(self.recent_errors),
+                "slowest": [{"path": path, "seconds": seconds} for seconds, path in sorted(self._slowest, reverse=True)],
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix="folderscan"):
+        data = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        metric("phase_seconds", "gauge", "Segundos por fase del escaneo",
+               [({"phase": name}, seconds) for name, seconds in sorted(data["phases"].items())])
+        metric("folders_total", "counter", "Carpetas visitadas", [({}, data["folders"])])
+        metric("cached_folders_total", "counter", "Carpetas tomadas del índice", [({}, data["cached_folders"])])
+        metric("files_total", "counter", "Ficheros visitados", [({}, data["files"])])
+        metric("scandir_calls_total", "counter", "Llamadas a scandir", [({}, data["scandir_calls"])])
+        metric("stat_calls_total", "counter", "Llamadas a stat", [({}, data["stat_calls"])])
+        metric("errors_total", "counter", "Errores por tipo",
+               [({"type": name}, count) for name, count in sorted(data["errors"].items())])
+        metric("slowest_folder_seconds", "gauge", "Carpetas más lentas de leer",
+               [({"path": item["path"]}, item["seconds"]) for item in data["slowest"]])
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """Guarda las métricas en ``path``: formato Prometheus si acaba en ``.prom``, si no JSON"""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def summary(self):
+        """Resumen de una línea para la barra de estado"""
+        data = self.snapshot()
+        phases = data["phases"]
+        parts = [f"Lectura {phases.get('lectura', 0):.1f} s"]
+        if "interfaz" in phases:
+            parts.append(f"interfaz {phases['interfaz']:.1f} s")
+        parts.append(f"{data['folders']} carpetas ({data['cached_folders']} del índice)")
+        parts.append(f"{data['files']} ficheros, {data['stat_calls']} stat")
+        if data["errors"]:
+            parts.append("errores: " + ", ".join(f"{name} {count}" for name, count in data["errors"].items()))
+        if data["slowest"]:
+            slowest = data["slowest"][0]
+            parts.append(f"más lenta: {slowest['path']} ({slowest['seconds']:.2f} s)")
+        return " · ".join(parts)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,82 @@
+"""Barras de progreso de la interfaz.
+
+Cada una importa su biblioteca al crearse, así que ``tqdm`` solo hace falta
+si se elige y este módulo no arrastra ``tkinter`` a los usos sin interfaz.
+Todas tienen la misma forma: ``start`` al empezar (total aún desconocido),
+``update`` con lo hecho y, si se sabe, el total, y ``finish`` al acabar.
+"""
+
+
+class TtkProgress:
+    """``ttk.Progressbar`` con su etiqueta, al pie de la ventana"""
+
+    def __init__(self, parent):
+        from tkinter import LEFT, X, Frame, ttk
+
+        self.frame = Frame(parent, bg="#f0f0f0")
+        self.frame.pack(fill=X, padx=10, pady=(0, 10))
+        self.label = ttk.Label(self.frame, text="Progreso:", style="TLabel")
+        self.label.pack(side=LEFT)
+        self.bar = ttk.Progressbar(self.frame, orient="horizontal", length=300, mode="determinate")
+        self.bar.pack(side=LEFT, padx=10)
+
+    def start(self):
+        self.bar["value"] = 0
+        self.bar.configure(mode="indeterminate")
+        self.bar.start(20)
+        self.label.config(text="Progreso: 0")
+
+    def update(self, done, total=None, text="Progreso", approximate=True):
+        """Con ``approximate`` el total se muestra como estimación (``~``)"""
+        if total is None:
+            self.label.config(text=f"{text}: {done}")
+            return
+        if str(self.bar.cget("mode")) != "determinate":
+            self.bar.stop()
+            self.bar.configure(mode="determinate")
+        self.bar["maximum"] = total
+        self.bar["value"] = done
+        self.label.config(text=f"{text}: {done}/{'~' if approximate else ''}{total}")
+
+    def finish(self):
+        self.bar.stop()
+        self.bar.configure(mode="determinate")
+        self.bar["value"] = 0
+        self.label.config(text="Progreso:")
+
+
+class TqdmProgress:
+    """Barra de ``tqdm`` en la consola desde la que se lanzó la interfaz"""
+
+    def __init__(self, parent=None):
+        from tqdm import tqdm
+
+        self._tqdm = tqdm
+        self._bar = None
+
+    def start(self):
+        self.finish()
+        self._bar = self._tqdm(desc="Escaneando carpetas")
+
+    def update(self, done, total=None, text="Progreso", approximate=True):
+        if self._bar is None:
+            return
+        if text != "Progreso":
+            self._bar.set_description(text, refresh=False)
+        if total is not None and self._bar.total != total:
+            self._bar.total = total
+            self._bar.refresh()
+        self._bar.update(done - self._bar.n)
+
+    def finish(self):
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+
+
+BACKENDS = {"ttk": TtkProgress, "tqdm": TqdmProgress}
+
+
+def make_progress(kind, parent):
+    """Crea la barra ``kind`` (``ttk`` o ``tqdm``) dentro de ``parent``"""
+    return BACKENDS[kind](parent)
@@ -0,0 +1,89 @@
+import collections
+import queue
+import threading
+import time
+
+
+class ScanPump:
+    """Ejecuta un escaneo en un hilo y entrega los resultados por lotes al hilo de la interfaz.
+
+    El hilo de escaneo nunca toca la interfaz: agrupa los resultados y los deja
+    en una cola. La interfaz la vacía con ``schedule`` (``root.after`` en Tk) a
+    un ritmo fijo y procesa como mucho ``max_per_tick`` resultados por vuelta,
+    así que el escaneo no espera a que se redibuje la ventana y la ventana
+    sigue respondiendo aunque el escaneo vaya muy por delante.
+
+    ``on_batch(resultados, escaneadas, total)`` recibe cada lote y
+    ``on_done(error)`` se llama al final (``error`` es ``None`` si todo fue bien).
+    ``estimate``, si se da, se consulta en cada vuelta para obtener el
+    ``total`` estimado (``None`` si aún no se sabe), p. ej.
+    ``FolderScanner.estimate_total``; así no hace falta contar las carpetas
+    antes de escanear.
+    """
+
+    def __init__(self, results, schedule, on_batch, on_done, estimate=None, interval_ms=50, max_per_tick=5000):
+        self.results = results
+        self.schedule = schedule
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.estimate = estimate
+        self.interval_ms = interval_ms
+        self.max_per_tick = max_per_tick
+        self.scanned = 0
+        self.total = None
+        self.running = False
+        self._queue = queue.Queue()
+        self._pending = collections.deque()
+        self._finished = False
+        self._error = None
+
+    def start(self):
+        self.running = True
+        thread = threading.Thread(target=self._produce, daemon=True)
+        thread.start()
+        self.schedule(self.interval_ms, self._drain)
+
+    def _produce(self):
+        try:
+            interval = self.interval_ms / 1000
+            batch = []
+            last = time.monotonic()
+            for result in self.results:
+                batch.append(result)
+                now = time.monotonic()
+                if now - last >= interval:
+                    self._queue.put(("batch", batch))
+                    batch = []
+                    last = now
+            if batch:
+                self._queue.put(("batch", batch))
+            self._queue.put(("done", None))
+        except Exception as e:
+            self._queue.put(("done", e))
+
+    def _drain(self):
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "batch":
+                self._pending.extend(payload)
+            else:
+                self._finished = True
+                self._error = payload
+
+        batch = []
+        while self._pending and len(batch) < self.max_per_tick:
+            batch.append(self._pending.popleft())
+        if batch:
+            if self.estimate is not None:
+                self.total = self.estimate()
+            self.scanned += len(batch)
+            self.on_batch(batch, self.scanned, self.total)
+
+        if self._finished and not self._pending:
+            self.running = False
+            self.on_done(self._error)
+        else:
+            self.schedule(self.interval_ms, self._drain)
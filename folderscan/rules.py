@@ -0,0 +1,114 @@
+import os
+import re
+
+
+def _translate(pattern):
+    """Convierte un patrón estilo ``.gitignore`` en una expresión regular sobre rutas con ``/``"""
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    regex = "".join(out)
+    # Sin barra intermedia el patrón vale a cualquier profundidad, como en .gitignore
+    return regex if anchored else "(?:.*/)?" + regex
+
+
+class ScanRules:
+    """Reglas para podar el recorrido: patrones, profundidad máxima y un solo sistema de ficheros.
+
+    Los patrones siguen la sintaxis de ``.gitignore`` y se aplican a las rutas
+    de carpeta relativas a la raíz: sin barra valen a cualquier profundidad
+    (``node_modules``), con barra se anclan a la raíz (``build/cache``), ``*``
+    y ``?`` no cruzan carpetas y ``**`` sí. Un patrón que empieza por ``!``
+    (o cualquiera de ``include``) vuelve a incluir lo que excluía otro
+    anterior; como en git, gana el último patrón que encaja.
+
+    Todos los patrones se compilan en una única expresión regular. Las carpetas
+    podadas no se llegan a abrir y no cuentan en los tamaños.
+    """
+
+    def __init__(self, exclude=(), include=(), max_depth=None, one_filesystem=False):
+        self.patterns = [p for p in (p.strip() for p in exclude) if p and not p.startswith("#")]
+        self.patterns += ["!" + p.strip().lstrip("!") for p in include if p.strip()]
+        self.max_depth = max_depth
+        self.one_filesystem = one_filesystem
+        # Raíz -> st_dev; por raíz porque ``MultiRootScanner`` comparte las reglas entre hilos
+        self._root_devices = {}
+        self._negated = []
+        alternatives = []
+        # Al revés para que la primera alternativa que encaja sea el último patrón
+        for pattern in reversed(self.patterns):
+            negated = pattern.startswith("!")
+            self._negated.append(negated)
+            alternatives.append(f"(?P<p{len(alternatives)}>{_translate(pattern[1:] if negated else pattern)})")
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    @classmethod
+    def from_file(cls, path, **options):
+        """Lee los patrones de un fichero con el formato de ``.gitignore``"""
+        with open(path, encoding="utf-8") as f:
+            return cls(exclude=f.read().splitlines(), **options)
+
+    def __bool__(self):
+        return self._regex is not None or self.max_depth is not None or self.one_filesystem
+
+    def excluded(self, relative):
+        """Indica si la carpeta ``relative`` (relativa a la raíz, separada por ``/``) se poda"""
+        if self._regex is None:
+            return False
+        match = self._regex.fullmatch(relative)
+        return match is not None and not self._negated[int(match.lastgroup[1:])]
+
+    def prune(self, root, subdirs, depth, onerror):
+        """Devuelve las subcarpetas de ``subdirs`` (a profundidad ``depth``) que hay que recorrer"""
+        if self.max_depth is not None and depth > self.max_depth:
+            return []
+        if self._regex is not None:
+            cut = len(os.path.join(root, ""))
+            subdirs = [path for path in subdirs if not self.excluded(path[cut:].replace(os.sep, "/"))]
+        if self.one_filesystem and subdirs:
+            if root not in self._root_devices:
+                # Si dos hilos llegan a la vez los dos guardan el mismo valor
+                self._root_devices[root] = _device(root, onerror)
+            device = self._root_devices[root]
+            subdirs = [path for path in subdirs if _device(path, onerror) == device]
+        return subdirs
+
+
+def _device(path, onerror):
+    try:
+        return os.lstat(path).st_dev
+    except OSError as e:
+        onerror(e)
+        return None
@@ -0,0 +1,151 @@
+import os
+import queue
+import threading
+
+from .engine import FolderScanner, ScanCancelled, _print_error
+
+
+def device_of(path):
+    """Dispositivo (``st_dev``) en el que está ``path``"""
+    return os.stat(path).st_dev
+
+
+def _outermost(roots):
+    """Quita las raíces repetidas y las que cuelgan de otra raíz, que ya se suman en ella"""
+    kept = []
+    for root in sorted(roots, key=lambda root: len(os.path.realpath(root))):
+        real = os.path.realpath(root)
+        if not any(real == other or real.startswith(os.path.join(other, "")) for _, other in kept):
+            kept.append((root, real))
+    chosen = {root for root, _ in kept}
+    return [root for root in dict.fromkeys(roots) if root in chosen]
+
+
+class MultiRootScanner:
+    """Escanea varias carpetas raíz a la vez, con un límite de hilos por dispositivo.
+
+    Las raíces se agrupan por ``st_dev`` y cada dispositivo tiene su propio
+    hilo, que escanea sus raíces una detrás de otra con un ``FolderScanner`` de
+    ``device_workers[dispositivo]`` hilos de lectura (``workers`` si no se
+    indica). Así un disco duro no recibe más lecturas a la vez de las que
+    aguanta sin dar saltos con el cabezal, un SSD o un NFS pueden tener
+    muchas, y los dispositivos distintos trabajan en paralelo, de modo que el
+    total se acerca a la suma de lo que da cada uno.
+
+    ``device_workers`` va de una ruta cualquiera del dispositivo (p. ej. su
+    punto de montaje) o de su ``st_dev`` al número de hilos. Una raíz dentro
+    de otra se descarta, porque ya se cuenta en la de fuera.
+
+    ``scan`` entrega los ``FolderResult`` de todas las raíces mezclados según
+    terminan; cada raíz llega después de sus subcarpetas y su resultado es el
+    subtotal, que también queda en ``totals``. ``index``, ``checkpoint``,
+    ``metrics``, ``rules``, ``on_file`` y ``reuse_index`` se pasan a cada ``FolderScanner``; en
+    ``metrics`` la fase ``total`` va del principio al final del escaneo de todas.
+    """
+
+    def __init__(self, roots, onerror=None, workers=1, device_workers=None, index=None, checkpoint=None,
+                 metrics=None, rules=None, on_file=None, reuse_index=True):
+        self.onerror = onerror if onerror is not None else _print_error
+        self.metrics = metrics
+        self.checkpoint = checkpoint if on_file is None else None  # Como en ``FolderScanner``
+        limits = {}
+        for key, count in (device_workers or {}).items():
+            try:
+                limits[key if isinstance(key, int) else device_of(key)] = max(1, int(count))
+            except OSError as e:
+                self.onerror(e)
+        self.devices = {}  # st_dev -> raíces, en el orden dado
+        for root in _outermost([os.fspath(root) for root in roots]):
+            try:
+                self.devices.setdefault(device_of(root), []).append(root)
+            except OSError as e:
+                self.onerror(e)
+        self.limits = {device: limits.get(device, max(1, int(workers))) for device in self.devices}
+        self.roots = [root for device_roots in self.devices.values() for root in device_roots]
+        self.scanners = {
+            root: FolderScanner(root, self.onerror, self.limits[device], index, checkpoint, metrics=metrics,
+                                rules=rules, on_file=on_file, reuse_index=reuse_index)
+            for device, device_roots in self.devices.items() for root in device_roots}
+        self.totals = {}  # Raíz -> ``FolderResult`` de la raíz, según van terminando
+        self._cancelled = threading.Event()
+
+    def scan(self):
+        """Genera los ``FolderResult`` de todas las raíces según se completan"""
+        self.totals = {}
+        results = queue.Queue()
+        done = object()
+
+        def run(device_roots):
+            try:
+                for root in device_roots:
+                    if self._cancelled.is_set():
+                        break
+                    for result in self.scanners[root].scan():
+                        results.put(result)
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(done)
+
+        threads = [threading.Thread(target=run, args=(device_roots,), daemon=True)
+                   for device_roots in self.devices.values()]
+        if self.metrics is not None:
+            self.metrics.start()  # Los de cada raíz quedan anidados en este
+        for thread in threads:
+            thread.start()
+        try:
+            remaining, error = len(threads), None
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, BaseException):
+                    # Se cancela el resto y se lanza el primer error cuando todos han parado
+                    error = error or item
+                    self.cancel()
+                elif error is None:
+                    if item.path in self.scanners:
+                        self.totals[item.path] = item
+                    yield item
+            if error is not None:
+                raise error
+            if self._cancelled.is_set():
+                raise ScanCancelled(", ".join(self.roots))
+        finally:
+            if remaining:
+                self.cancel()  # El consumidor ha dejado de leer: parar los hilos
+            for thread in threads:
+                thread.join()
+            if self.metrics is not None:
+                self.metrics.finish()
+
+    def pause(self):
+        for scanner in self.scanners.values():
+            scanner.pause()
+
+    def resume(self):
+        for scanner in self.scanners.values():
+            scanner.resume()
+
+    def cancel(self):
+        self._cancelled.set()
+        for scanner in self.scanners.values():
+            scanner.cancel()
+
+    @property
+    def paused(self):
+        return any(scanner.paused for scanner in self.scanners.values())
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def folders_read(self):
+        return sum(scanner.folders_read for scanner in self.scanners.values())
+
+    def estimate_total(self):
+        """Suma de las estimaciones de las raíces empezadas; ``None`` si aún no hay ninguna"""
+        estimates = [scanner.estimate_total() for scanner in self.scanners.values() if scanner.folders_read]
+        known = [estimate for estimate in estimates if estimate is not None]
+        return sum(known) if known else None
@@ -0,0 +1,160 @@
+import bisect
+import itertools
+import os
+import re
+from array import array
+
+from .rules import _translate
+from .store import np
+
+_GLOB_CHARS = re.compile(r"\*|\?|\[[^\]]*\]")
+
+
+class SearchIndex:
+    """Índice de búsqueda sobre los nombres de carpeta de un ``ResultStore``.
+
+    Se construye una vez al terminar el escaneo. Como el almacén guarda cada
+    nombre distinto una sola vez, se buscan esos nombres, unidos en minúsculas
+    en una sola cadena que las expresiones regulares recorren en C, y una
+    tabla aparte da las carpetas que llevan cada nombre. Solo se reconstruye
+    la parte de la ruta que hace falta comprobar, subiendo por los padres de
+    las carpetas candidatas, así que no se recorre todo el almacén.
+
+    Las consultas no distinguen mayúsculas. Sin comodines buscan un trozo de
+    ruta (``python``, ``lib/pyth``; con ``/`` al final el último nombre tiene
+    que ser entero); con ``*``, ``?`` o ``[...]`` son patrones con la sintaxis
+    de ``ScanRules`` sobre la ruta relativa a la raíz. En los dos casos el
+    resultado son las carpetas en las que termina la coincidencia, no también
+    todas las que cuelgan de ellas.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._version = (len(store), store.removed, len(store.names))
+        self._names = [name.lower() for name in store.names]
+        # Cada nombre va entre dos saltos de línea: el nombre i es _blob[_offsets[i] + 1:_offsets[i + 1]]
+        self._blob = "\n" + "\n".join(self._names) + "\n"
+        self._offsets = array("q", itertools.accumulate((len(name) + 1 for name in self._names), initial=0))
+        # Carpetas agrupadas por nombre: las de name_id son _by_name[_start[name_id]:_start[name_id + 1]]
+        n = len(store)
+        if np is not None and n:
+            name_ids = np.frombuffer(store.name_ids, dtype=np.uint32)
+            order = np.argsort(name_ids, kind="stable")
+            self._by_name = order.tolist()
+            self._start = np.searchsorted(name_ids[order], np.arange(len(self._names) + 1)).tolist()
+        else:
+            counts = [0] * (len(self._names) + 1)
+            for name_id in store.name_ids:
+                counts[name_id + 1] += 1
+            for i in range(len(self._names)):
+                counts[i + 1] += counts[i]
+            self._start = counts[:]
+            self._by_name = [0] * n
+            fill = counts[:-1]
+            for index, name_id in enumerate(store.name_ids):
+                self._by_name[fill[name_id]] = index
+                fill[name_id] += 1
+
+    @property
+    def stale(self):
+        """Indica si el almacén ha cambiado (p. ej. al vigilar) desde que se construyó el índice"""
+        return self._version != (len(self.store), self.store.removed, len(self.store.names))
+
+    def _name_at(self, position):
+        # Número del nombre que contiene la posición; -1 o el total si cae fuera de los nombres
+        return bisect.bisect_left(self._offsets, position) - 1
+
+    def _find_names(self, needle):
+        """Números de los nombres que contienen ``needle``, que puede empezar y acabar en salto de línea"""
+        blob, offsets, count, found = self._blob, self._offsets, len(self._names), []
+        skip = 1 if needle.startswith("\n") else 0
+        position = blob.find(needle)
+        while position >= 0:
+            name_id = self._name_at(position + skip)
+            if name_id >= count:
+                break
+            found.append(name_id)
+            position = blob.find(needle, offsets[name_id + 1])
+        return found
+
+    def _matching_names(self, regex):
+        """Números de los nombres en los que ``regex`` (``re.MULTILINE``) encaja al menos una vez"""
+        count, found, end = len(self._names), [], -1
+        for match in regex.finditer(self._blob):
+            if match.start() >= end:
+                name_id = self._name_at(match.start())
+                if name_id >= count:
+                    break
+                if name_id >= 0:
+                    found.append(name_id)
+                    end = self._offsets[name_id + 1] + 1
+        return found
+
+    def _folders(self, name_ids):
+        store = self.store
+        for name_id in name_ids:
+            for index in self._by_name[self._start[name_id]:self._start[name_id + 1]]:
+                if index != store.root_index and store.alive(index):
+                    yield index
+
+    def _ancestors_match(self, index, pieces):
+        """Comprueba que los padres de ``index`` acaban en ``pieces``; el primero puede ser un final de nombre"""
+        store = self.store
+        for position in range(len(pieces) - 1, -1, -1):
+            index = store.parents[index]
+            if index < 0:
+                return False
+            if index == store.root_index:
+                name = store.root.lower().rstrip(os.sep)  # El nombre de la raíz es su ruta entera
+            else:
+                name = self._names[store.name_ids[index]]
+            if not (name.endswith(pieces[0]) if position == 0 else name == pieces[position]):
+                return False
+        return True
+
+    def search(self, query):
+        """Índices de las carpetas que encajan con ``query``, ordenados"""
+        query = query.strip().lower().replace("/", os.sep)
+        if not query or self.store.root_index < 0:
+            return []
+        if _GLOB_CHARS.search(query):
+            return self._search_glob(query)
+        exact = query.endswith(os.sep) and query != os.sep
+        pieces = (query.rstrip(os.sep) or query).split(os.sep)
+        last = pieces.pop()
+        if exact:
+            name_ids = self._find_names(f"\n{last}\n")
+        else:
+            # Sin separador vale cualquier trozo del nombre; con él, solo el principio
+            name_ids = self._find_names(f"\n{last}" if pieces else last)
+        if not pieces:
+            return sorted(self._folders(name_ids))
+        return sorted(index for index in self._folders(name_ids) if self._ancestors_match(index, pieces))
+
+    def _search_glob(self, pattern):
+        pattern = pattern.replace(os.sep, "/").strip("/")
+        # Primero el último componente contra los nombres; la ruta entera solo para los que encajan
+        component = pattern.rsplit("/", 1)[-1]
+        # Un componente no tiene barras: sobra el prefijo que deja bajar a cualquier profundidad
+        name_regex = _translate(component).removeprefix("(?:.*/)?")
+        literal = max(_GLOB_CHARS.split(component), key=len)
+        if len(literal) >= 2:
+            # El trozo literal más largo se busca con ``find`` y el patrón solo se prueba en esos nombres
+            matcher = re.compile(name_regex).fullmatch
+            name_ids = [name_id for name_id in self._find_names(literal) if matcher(self._names[name_id])]
+        else:
+            regex = re.compile("^(?:" + name_regex.replace("[^", "[^\\n") + ")$", re.MULTILINE)
+            name_ids = self._matching_names(regex)
+        candidates = self._folders(name_ids)
+        if "/" not in pattern:
+            return sorted(candidates)
+        regex = re.compile(_translate(pattern), re.IGNORECASE)
+        store = self.store
+        if store.roots is None:
+            cut = len(os.path.join(store.root, ""))
+            relative = lambda path: path[cut:]
+        else:
+            # Con varias raíces, la ruta relativa a la carpeta escaneada de la que cuelga
+            relative = lambda path: os.path.relpath(path, store.base(path)[0])
+        return sorted(index for index in candidates
+                      if regex.fullmatch(relative(store.path(index)).replace(os.sep, "/")))
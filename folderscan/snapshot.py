@@ -0,0 +1,266 @@
+import itertools
+import json
+import mmap
+import os
+import sys
+import zlib
+from array import array
+from typing import NamedTuple
+
+from .store import ResultStore, np
+
+MAGIC = b"FOLDERSNAP2\n"
+_MASK = (1 << 64) - 1
+_COLUMNS = (("name_ids", "I"), ("parents", "q"), ("sizes", "q"), ("files", "q"), ("mtimes", "q"))
+
+
+class SnapshotChange(NamedTuple):
+    """Diferencia de una carpeta entre dos instantáneas"""
+    path: str
+    old_size: int
+    new_size: int
+    delta: int
+    status: str  # "nueva", "borrada" o "cambiada"
+
+
+def _mix(x):
+    # splitmix64: reparte bien los bits con pocas operaciones
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _own_signatures(store):
+    """Firma de cada carpeta sin contar sus subcarpetas: nombre, tamaño, ficheros y ``mtime``"""
+    name_hashes = [zlib.crc32(name.encode("utf-8", "surrogateescape")) for name in store.names]
+    if np is not None:
+        with np.errstate(over="ignore"):
+            def mix(x):
+                x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+                x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+                return x ^ (x >> np.uint64(31))
+
+            def column(values, dtype):
+                return np.frombuffer(values, dtype=dtype).astype(np.uint64) if len(values) else np.empty(0, np.uint64)
+
+            names = np.array(name_hashes, dtype=np.uint64)[column(store.name_ids, np.uint32).astype(np.intp)]
+            signature = mix(column(store.mtimes, np.int64))
+            signature = mix(signature ^ column(store.files, np.int64))
+            signature = mix(signature ^ column(store.sizes, np.int64))
+            return mix(signature ^ names).tolist()
+    return [_mix(_mix(_mix(_mix(mtime & _MASK) ^ files) ^ (size & _MASK)) ^ name_hashes[name_id])
+            for name_id, size, files, mtime in zip(store.name_ids, store.sizes, store.files, store.mtimes)]
+
+
+def subtree_signatures(store):
+    """Devuelve la firma de cada subárbol: la suya propia más la suma de las de sus hijos.
+
+    La suma no depende del orden de los hijos y cualquier cambio en una carpeta
+    cambia la firma de todos sus antecesores, así que dos subárboles con la
+    misma firma se pueden dar por iguales sin recorrerlos.
+    """
+    signatures = _own_signatures(store)
+    parents = store.parents
+    # Los escaneos entregan los hijos antes que los padres; las carpetas añadidas
+    # después (modo vigilancia) rompen ese orden y hay que recorrer el árbol
+    if all(parent > i or parent < 0 for i, parent in enumerate(parents)):
+        order = range(len(parents))
+    else:
+        order = []
+        pending = [(store.root_index, False)] if store.root_index >= 0 else []
+        while pending:
+            index, expanded = pending.pop()
+            if expanded:
+                order.append(index)
+            else:
+                pending.append((index, True))
+                pending.extend((child, False) for child in store.children(index))
+    for i in order:
+        parent = parents[i]
+        if parent >= 0:
+            signatures[parent] = (signatures[parent] + signatures[i]) & _MASK
+    return array("Q", signatures)
+
+
+class MappedNames:
+    """Tabla de nombres de una instantánea abierta con ``mmap``.
+
+    Los nombres están en el fichero separados por ``\0`` y cada uno se
+    decodifica al pedirlo, así que abrir la instantánea no crea millones de
+    cadenas: solo las de las filas que se llegan a mostrar. Recorrerla entera
+    (p. ej. para el índice de búsqueda) decodifica todo el bloque de una vez.
+    Los nombres añadidos después quedan en una lista aparte.
+    """
+
+    def __init__(self, blob, offsets):
+        self._blob = blob  # Nombres separados por \0
+        self._offsets = offsets  # Inicio de cada nombre en _blob y, al final, el tamaño de _blob + 1
+        self._count = len(offsets) - 1
+        self._added = []
+
+    def __len__(self):
+        return self._count + len(self._added)
+
+    def __getitem__(self, name_id):
+        if 0 <= name_id < self._count:
+            start, end = self._offsets[name_id], self._offsets[name_id + 1] - 1
+            return str(self._blob[start:end], "utf-8", "surrogateescape")
+        if name_id < 0:
+            return self[name_id + len(self)]
+        return self._added[name_id - self._count]
+
+    def __iter__(self):
+        if self._count:
+            yield from str(self._blob, "utf-8", "surrogateescape").split("\0")
+        yield from self._added
+
+    def append(self, name):
+        self._added.append(name)
+
+
+def _align(position):
+    return (position + 7) & ~7
+
+
+def _sections(start, header):
+    """``(atributo, tipo, desplazamiento, elementos)`` de cada bloque del fichero, alineados a 8 bytes"""
+    count = header["count"]
+    extra = (("signatures", "Q"), ("child_order", "q"), ("child_start", "q"), ("name_offsets", "q"))
+    for name, typecode in _COLUMNS + extra:
+        if name == "name_offsets":
+            length = header["names"] + 1
+        elif name == "child_order":
+            length = count - header["orphans"]
+        else:
+            length = count + (name == "child_start")
+        yield name, typecode, start, length
+        start = _align(start + length * array(typecode).itemsize)
+    yield "names", "B", start, header["names_bytes"]
+
+
+def save_snapshot(store, path, scanned_ns=None):
+    """Guarda los resultados de un escaneo y sus firmas en un fichero binario.
+
+    Tras una cabecera JSON van las columnas del ``ResultStore`` como registros
+    de ancho fijo, las firmas, el índice de hijos (que con millones de
+    carpetas cuesta más de un segundo calcular), el inicio de cada nombre y
+    la tabla de nombres sin repetir, cada bloque alineado a 8 bytes para que
+    ``load_snapshot`` lo use directamente desde ``mmap``.
+    """
+    if store.roots is not None:
+        raise ValueError("Las instantáneas admiten una sola carpeta raíz")
+    signatures = subtree_signatures(store)
+    if store._children is None:
+        store._children = store._build_children()
+    child_order, child_start = (column if isinstance(column, (array, memoryview)) else array("q", column)
+                                for column in store._children)
+    encoded = [name.encode("utf-8", "surrogateescape") for name in store.names]
+    names = b"\0".join(encoded)
+    name_offsets = array("q", itertools.accumulate((len(name) + 1 for name in encoded), initial=0))
+    header = {
+        "root": store.root,
+        "root_index": store.root_index,
+        "count": len(store),
+        "names": len(encoded),
+        "names_bytes": len(names),
+        "removed": store.removed,
+        "orphans": len(store) - len(child_order),  # La raíz y las eliminadas no son hijas de nadie
+        "byteorder": sys.byteorder,
+        "scanned_ns": scanned_ns,
+    }
+    encoded_header = json.dumps(header).encode("utf-8")
+    start = _align(len(MAGIC) + 4 + len(encoded_header))
+    blocks = {"signatures": signatures, "child_order": child_order, "child_start": child_start,
+              "name_offsets": name_offsets, "names": names}
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded_header).to_bytes(4, "little"))
+        f.write(encoded_header)
+        for name, _, offset, _ in _sections(start, header):
+            f.write(bytes(offset - f.tell()))
+            f.write(blocks[name] if name in blocks else getattr(store, name))
+
+
+def load_snapshot(path):
+    """Abre una instantánea como ``ResultStore`` con los atributos ``signatures`` y ``scanned_ns``.
+
+    El fichero se proyecta en memoria y las columnas son vistas sobre él, así
+    que abrirla no depende del número de carpetas: el sistema lee del disco
+    solo las páginas que se van usando. La proyección es privada (se puede
+    cambiar un tamaño sin tocar el fichero) pero sus columnas no admiten
+    carpetas nuevas.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es una instantánea del analizador")
+        header_size = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(header_size))
+        data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+    store = ResultStore(header["root"])
+    store.root_index = header["root_index"]
+    swap = header["byteorder"] != sys.byteorder
+    blob, name_offsets, columns = b"", array("q", [0]), {}
+    for name, typecode, offset, length in _sections(_align(len(MAGIC) + 4 + header_size), header):
+        raw = data[offset:offset + length * array(typecode).itemsize]
+        if len(raw) != length * array(typecode).itemsize:
+            raise ValueError(f"{path} está incompleta")
+        if name == "names":
+            blob = raw
+            continue
+        if swap:
+            column = array(typecode, raw.tobytes())
+            column.byteswap()
+        else:
+            column = raw.cast(typecode)
+        columns[name] = column
+        if name == "name_offsets":
+            name_offsets = column
+        elif name not in ("child_order", "child_start"):
+            setattr(store, name, column)
+    store.names = MappedNames(blob, name_offsets)
+    store._name_ids = None
+    store._children = (columns["child_order"], columns["child_start"])
+    store.removed = header["removed"]
+    store.scanned_ns = header["scanned_ns"]
+    return store
+
+
+def _children_by_name(store, index):
+    return {store.name(child): child for child in store.children(index) if store.alive(child)}
+
+
+def diff_snapshots(old, new, min_delta=0):
+    """Compara dos instantáneas de la misma raíz y devuelve los cambios de mayor a menor crecimiento.
+
+    Los subárboles con la misma firma no se recorren. De una carpeta nueva o
+    borrada solo se lista la propia carpeta, no todo su subárbol.
+    """
+    old_signatures = getattr(old, "signatures", None) or subtree_signatures(old)
+    new_signatures = getattr(new, "signatures", None) or subtree_signatures(new)
+    changes = []
+    if old.root_index < 0 or new.root_index < 0:
+        return changes
+    pending = [(old.root_index, new.root_index, new.root)]
+    while pending:
+        old_index, new_index, path = pending.pop()
+        if old_signatures[old_index] == new_signatures[new_index]:
+            continue
+        old_size, new_size = old.sizes[old_index], new.sizes[new_index]
+        if old_size != new_size:
+            changes.append(SnapshotChange(path, old_size, new_size, new_size - old_size, "cambiada"))
+        old_children = _children_by_name(old, old_index)
+        for name, new_child in _children_by_name(new, new_index).items():
+            child_path = os.path.join(path, name)
+            old_child = old_children.pop(name, None)
+            if old_child is None:
+                size = new.sizes[new_child]
+                changes.append(SnapshotChange(child_path, 0, size, size, "nueva"))
+            else:
+                pending.append((old_child, new_child, child_path))
+        for name, old_child in old_children.items():
+            size = old.sizes[old_child]
+            changes.append(SnapshotChange(os.path.join(path, name), size, 0, -size, "borrada"))
+    changes = [change for change in changes if abs(change.delta) >= min_delta]
+    changes.sort(key=lambda change: change.delta, reverse=True)
+    return changes
@@ -0,0 +1,244 @@
+import heapq
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usan las versiones en Python puro
+    np = None
+
+_REMOVED = -2  # Valor de ``parent`` de una carpeta eliminada
+
+
+class ResultStore:
+    """Resultados de un escaneo guardados en columnas compactas.
+
+    En lugar de una tupla ``(ruta, tamaño)`` por carpeta se guarda una tabla de
+    nombres sin repetir y, por carpeta, el índice de su nombre, el índice de su
+    padre, su tamaño, su número de ficheros y su ``mtime`` en ``array`` tipados
+    (unos 36 bytes por carpeta). Las rutas completas solo se reconstruyen al mostrarlas
+    o exportarlas. Con numpy instalado, ordenar y sacar las N mayores se hace
+    de forma vectorizada sobre las columnas.
+
+    Los resultados llegan en postorden (hijos antes que el padre), así que el
+    padre de cada carpeta se resuelve cuando llega: mientras tanto solo se
+    guardan las carpetas a la espera de cada padre pendiente.
+
+    Con ``roots`` (rutas absolutas) se reúnen los resultados de varias
+    carpetas escaneadas a la vez (``MultiRootScanner``): cada una cuelga, con
+    su ruta entera como nombre, de una raíz ficticia que solo se llama
+    ``root`` y que llega, con la suma de todas, cuando ha llegado la última.
+    """
+
+    def __init__(self, root, roots=None):
+        self.root = os.fspath(root)
+        self.roots = dict.fromkeys(os.fspath(root) for root in roots) if roots else None  # Raíz -> índice
+        self.root_index = -1
+        self.names = []  # Tabla de nombres
+        self._name_ids = {}
+        self.name_ids = array("I")
+        self.parents = array("q")
+        self.sizes = array("q")
+        self.files = array("q")
+        self.mtimes = array("q")
+        self._waiting = {}  # Ruta del padre -> índices de los hijos que esperan
+        self._children = None  # Índice CSR de hijos, se construye al pedirlo
+        self.removed = 0
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def _name_id(self, name):
+        if self._name_ids is None:  # Tabla cargada de disco: el diccionario se crea al primer uso
+            self._name_ids = {name: i for i, name in enumerate(self.names)}
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def _append(self, name, parent, size, files, mtime_ns):
+        index = len(self.sizes)
+        self.name_ids.append(self._name_id(name))
+        self.parents.append(parent)
+        self.sizes.append(size)
+        self.files.append(files)
+        self.mtimes.append(mtime_ns)
+        self._children = None
+        return index
+
+    def _root_children(self, path):
+        # La ruta de los hijos puede no coincidir con la raíz si esta acaba en separador
+        waiting = self._waiting.pop(os.path.dirname(os.path.join(path, "x")), [])
+        if path in self._waiting:
+            waiting += self._waiting.pop(path)
+        return waiting
+
+    def add(self, result):
+        """Añade un ``FolderResult`` y devuelve su índice"""
+        path = result.path
+        if self.roots is not None and path in self.roots:
+            index = self.roots[path] = self._append(path, -1, result.size, result.files, result.mtime_ns)
+            self._waiting.setdefault(self.root, []).append(index)
+            waiting = self._root_children(path)
+            if None not in self.roots.values():
+                roots = list(self.roots.values())
+                self.root_index = self._append(self.root, -1, sum(self.sizes[i] for i in roots),
+                                               sum(self.files[i] for i in roots), 0)
+                for root in self._waiting.pop(self.root):
+                    self.parents[root] = self.root_index
+        elif path == self.root:
+            index = self._append(path, -1, result.size, result.files, result.mtime_ns)
+            self.root_index = index
+            waiting = self._root_children(path)
+        else:
+            index = self._append(os.path.basename(path), -1, result.size, result.files, result.mtime_ns)
+            self._waiting.setdefault(os.path.dirname(path), []).append(index)
+            waiting = self._waiting.pop(path, ())
+        for child in waiting:
+            self.parents[child] = index
+        return index
+
+    def add_child(self, parent, name, size, files=0, mtime_ns=0):
+        """Añade una carpeta nueva bajo ``parent`` (p. ej. detectada en modo vigilancia)"""
+        return self._append(name, parent, size, files, mtime_ns)
+
+    def remove(self, index):
+        """Marca como eliminada una carpeta y todo su subárbol; devuelve los índices quitados"""
+        pending = [index]
+        removed = []
+        while pending:
+            index = pending.pop()
+            if self.parents[index] == _REMOVED:
+                continue
+            pending.extend(self.children(index))
+            removed.append(index)
+        for index in removed:
+            self.parents[index] = _REMOVED
+        self.removed += len(removed)
+        self._children = None
+        return removed
+
+    def alive(self, index):
+        return self.parents[index] != _REMOVED
+
+    def name(self, index):
+        return self.names[self.name_ids[index]]
+
+    def path(self, index):
+        """Reconstruye la ruta completa de una carpeta"""
+        parts = []
+        while index >= 0:
+            parts.append(self.names[self.name_ids[index]])
+            index = self.parents[index]
+        return os.path.join(*reversed(parts))
+
+    def _build_children(self):
+        # Formato CSR: los hijos de i son order[start[i]:start[i + 1]]
+        n = len(self.parents)
+        if np is not None:
+            parents = np.frombuffer(self.parents, dtype=np.int64) if n else np.empty(0, np.int64)
+            order = np.argsort(parents, kind="stable")
+            start = np.searchsorted(parents[order], np.arange(n + 1))
+            return order.tolist(), start.tolist()
+        counts = [0] * (n + 1)
+        for parent in self.parents:
+            if parent >= 0:
+                counts[parent + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        start = counts[:]
+        order = [0] * start[n]
+        fill = counts[:-1]
+        for child, parent in enumerate(self.parents):
+            if parent >= 0:
+                order[fill[parent]] = child
+                fill[parent] += 1
+        return order, start
+
+    def children(self, index):
+        """Índices de las subcarpetas directas de ``index``"""
+        if self._children is None:
+            self._children = self._build_children()
+        order, start = self._children
+        return order[start[index]:start[index + 1]]
+
+    def base(self, path):
+        """``(raíz, índice)`` de la carpeta escaneada de la que cuelga ``path``, o ``None``"""
+        for root, index in (self.roots.items() if self.roots is not None else [(self.root, self.root_index)]):
+            if not os.path.relpath(path, root).startswith(os.pardir):
+                return root, index
+        return None
+
+    def find(self, path):
+        """Devuelve el índice de una ruta o ``None`` si no está"""
+        if self.root_index < 0:
+            return None
+        if path == self.root:
+            return self.root_index
+        found = self.base(path)
+        if found is None:
+            return None
+        root, index = found
+        relative = os.path.relpath(path, root)
+        if relative == os.curdir:
+            return index
+        for part in relative.split(os.sep):
+            for child in self.children(index):
+                if self.names[self.name_ids[child]] == part and self.alive(child):
+                    index = child
+                    break
+            else:
+                return None
+        return index
+
+    def indices(self):
+        """Índices de las carpetas vivas sin contar la raíz"""
+        return [i for i in range(len(self.parents)) if i != self.root_index and self.parents[i] != _REMOVED]
+
+    def _live_mask(self):
+        mask = np.frombuffer(self.parents, dtype=np.int64) != _REMOVED
+        if self.root_index >= 0:
+            mask[self.root_index] = False
+        return mask
+
+    def order_by_size(self):
+        """Índices ordenados de menor a mayor tamaño (sin la raíz)"""
+        if np is not None and len(self):
+            sizes = np.frombuffer(self.sizes, dtype=np.int64)
+            live = np.flatnonzero(self._live_mask())
+            return live[np.argsort(sizes[live], kind="stable")].tolist()
+        return sorted(self.indices(), key=self.sizes.__getitem__)
+
+    def order_by_name(self):
+        """Índices en orden de ruta: recorrido en profundidad con los hijos por nombre"""
+        order = []
+        if self.root_index < 0:
+            return sorted(self.indices(), key=self.path)
+        names, name_ids = self.names, self.name_ids
+        pending = [self.root_index]
+        while pending:
+            index = pending.pop()
+            if index != self.root_index:
+                order.append(index)
+            children = [c for c in self.children(index) if self.parents[c] != _REMOVED]
+            children.sort(key=lambda c: names[name_ids[c]], reverse=True)
+            pending.extend(children)
+        return order
+
+    def largest(self, n):
+        """Índices de las ``n`` carpetas más grandes, de mayor a menor (sin la raíz)"""
+        if n <= 0:
+            return []
+        if np is not None and len(self):
+            sizes = np.frombuffer(self.sizes, dtype=np.int64)
+            live = np.flatnonzero(self._live_mask())
+            if n < len(live):
+                live = live[np.argpartition(sizes[live], len(live) - n)[len(live) - n:]]
+            return live[np.argsort(-sizes[live], kind="stable")].tolist()
+        return heapq.nlargest(n, self.indices(), key=self.sizes.__getitem__)
+
+    def nbytes(self):
+        """Memoria aproximada de las columnas y la tabla de nombres"""
+        columns = (self.name_ids, self.parents, self.sizes, self.files, self.mtimes)
+        return sum(column.itemsize * len(column) for column in columns) + sum(len(name) + 49 for name in self.names)
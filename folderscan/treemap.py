@@ -0,0 +1,96 @@
+import collections
+from typing import NamedTuple
+
+
+class TreemapRect(NamedTuple):
+    """Rectángulo de una carpeta en el mapa, en píxeles"""
+    index: int  # Índice de la carpeta en el ``ResultStore``
+    x: float
+    y: float
+    w: float
+    h: float
+    depth: int  # 0 para la carpeta raíz del mapa
+
+
+def _worst(row_sum, row_min, row_max, side):
+    # Peor proporción de los rectángulos de una fila de área total row_sum a lo largo de side
+    square_sum, square_side = row_sum * row_sum, side * side
+    return max(square_side * row_max / square_sum, square_sum / (square_side * row_min))
+
+
+def squarify(areas, x, y, w, h):
+    """Reparte el rectángulo ``(x, y, w, h)`` en trozos de las áreas dadas, lo más cuadrados posible.
+
+    Algoritmo *squarified* de Bruls, Huizing y van Wijk: las áreas (positivas,
+    de mayor a menor y que sumen ``w * h``) se colocan en filas a lo largo del
+    lado corto y cada fila se cierra cuando añadir otra área empeoraría su
+    peor proporción. Devuelve un ``(x, y, w, h)`` por área, en el mismo orden.
+    """
+    rects = []
+    i, n = 0, len(areas)
+    while i < n:
+        side = min(w, h)
+        if side <= 0:
+            rects.extend((x, y, 0.0, 0.0) for _ in range(i, n))
+            break
+        j = i
+        row_sum, row_min, row_max, worst = 0.0, float("inf"), 0.0, float("inf")
+        while j < n:
+            area = areas[j]
+            candidate = _worst(row_sum + area, min(row_min, area), max(row_max, area), side)
+            if j > i and candidate > worst:
+                break
+            row_sum, row_min, row_max, worst = row_sum + area, min(row_min, area), max(row_max, area), candidate
+            j += 1
+        thickness = row_sum / side
+        if w >= h:
+            # Columna pegada a la izquierda
+            offset = y
+            for area in areas[i:j]:
+                rects.append((x, offset, thickness, area / thickness))
+                offset += area / thickness
+            x, w = x + thickness, w - thickness
+        else:
+            # Fila pegada arriba
+            offset = x
+            for area in areas[i:j]:
+                rects.append((offset, y, area / thickness, thickness))
+                offset += area / thickness
+            y, h = y + thickness, h - thickness
+        i = j
+    return rects
+
+
+def layout(store, index, x, y, w, h, min_size=4, pad=1, header=0):
+    """Genera los rectángulos del mapa de ``index`` nivel a nivel, de arriba abajo.
+
+    Solo se reparte el interior de las carpetas que miden al menos
+    ``min_size`` píxeles por lado y se descartan los rectángulos de menos de
+    un píxel, así que el trabajo depende del tamaño del lienzo y no del
+    número de carpetas: el mapa de la raíz de un árbol de millones de nodos
+    toca solo los que se llegan a ver. Al ser un generador, la interfaz puede
+    dibujar por tandas y abandonarlo si cambia el zoom. Los ficheros propios
+    de cada carpeta ocupan su parte del área sin rectángulo propio.
+    ``pad`` y ``header`` son los píxeles de margen y de cabecera que se dejan
+    dentro de cada carpeta para que se vea el borde y el nombre.
+    """
+    sizes = store.sizes
+    pending = collections.deque([(index, x, y, w, h, 0)])
+    while pending:
+        index, x, y, w, h, depth = pending.popleft()
+        yield TreemapRect(index, x, y, w, h, depth)
+        inner_w, inner_h = w - 2 * pad, h - 2 * pad - header
+        if inner_w < min_size or inner_h < min_size:
+            continue
+        items = [(sizes[child], child) for child in store.children(index) if store.alive(child) and sizes[child] > 0]
+        if not items:
+            continue
+        own = sizes[index] - sum(size for size, _ in items)
+        if own > 0:
+            items.append((own, -1))  # Hueco de los ficheros propios, sin dibujar
+        items.sort(reverse=True)
+        scale = inner_w * inner_h / sum(size for size, _ in items)
+        rects = squarify([size * scale for size, _ in items], x + pad, y + pad + header, inner_w, inner_h)
+        for (_, child), (cx, cy, cw, ch) in zip(items, rects):
+            if child >= 0 and cw >= 1 and ch >= 1:
+                pending.append((child, cx, cy, cw, ch, depth + 1))
@@ -0,0 +1,261 @@
+"""Modo vigilancia en Linux: mantiene los tamaños al día con inotify sin reescanear."""
+import ctypes
+import ctypes.util
+import errno
+import os
+import stat
+import struct
+import sys
+
+from .engine import scan_dir, _print_error
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+               | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+
+
+def available():
+    """Indica si el modo vigilancia está disponible en este sistema"""
+    return sys.platform.startswith("linux") and _libc() is not None
+
+
+_LIBC = []
+
+
+def _libc():
+    if not _LIBC:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        except OSError:
+            libc = None
+        if libc is not None and not hasattr(libc, "inotify_init1"):
+            libc = None
+        _LIBC.append(libc)
+    return _LIBC[0]
+
+
+class _Inotify:
+    """Envoltorio mínimo de inotify con ctypes"""
+
+    def __init__(self):
+        self.libc = _libc()
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path, mask):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self):
+        """Devuelve los eventos pendientes sin bloquear como ``(wd, mask, nombre)``"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FolderWatcher:
+    """Aplica los cambios de inotify a los resultados de un escaneo.
+
+    Los eventos se acumulan en el kernel entre llamadas a ``poll`` y se
+    agrupan por carpeta y nombre: por muchas escrituras que haya, cada fichero
+    afectado se consulta con un solo ``stat`` por llamada y la diferencia se
+    suma a la carpeta y a todos sus antecesores. El escaneo no guarda el tamaño
+    de cada fichero, así que la primera vez que cambia un fichero de una
+    carpeta esta se lee entera una vez para conocerlos.
+
+    Con las ``rules`` (``ScanRules``) del escaneo, las carpetas nuevas que
+    poda no se leen, no se vigilan y no suman a sus antecesores.
+    """
+
+    def __init__(self, root, results, onerror=None, rules=None):
+        self.root = os.fspath(root)
+        self.onerror = onerror if onerror is not None else _print_error
+        self.rules = rules if rules else None
+        self.sizes = {}  # Ruta -> tamaño acumulado
+        self.file_bytes = {}  # Ruta -> bytes de los ficheros directos
+        self._files = {}  # Ruta -> {nombre: bytes} de las carpetas ya leídas aquí
+        for result in results:
+            self.sizes[result.path] = result.size
+            self.file_bytes[result.path] = result.file_bytes
+        self._inotify = _Inotify()
+        self._paths = {}  # Descriptor de vigilancia -> ruta
+        self.overflowed = False  # El kernel ha perdido eventos: conviene reescanear
+        for path in self.sizes:
+            self._watch(path)
+
+    def _watch(self, path):
+        try:
+            self._paths[self._inotify.add_watch(path, _WATCH_MASK)] = path
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                e.strerror = "Límite de inotify alcanzado (fs.inotify.max_user_watches)"
+            self.onerror(e)
+
+    def _depth(self, path):
+        """Profundidad de ``path`` bajo la raíz, contada como en ``FolderScanner``"""
+        return os.path.relpath(path, self.root).count(os.sep) + 1
+
+    def _prune(self, subdirs, depth):
+        if self.rules is None:
+            return subdirs
+        return self.rules.prune(self.root, subdirs, depth, self.onerror)
+
+    def _scan_new(self, path, changed):
+        """Lee una carpeta nueva y su subárbol con las reglas del escaneo, los vigila y devuelve su tamaño"""
+        order, pending = [], [(path, self._depth(path))]
+        while pending:
+            folder, depth = pending.pop()
+            subdirs, _, file_bytes = self._read_files(folder)
+            order.append(folder)
+            self.sizes[folder] = self.file_bytes[folder] = file_bytes
+            pending.extend((subdir, depth + 1) for subdir in self._prune(subdirs, depth + 1))
+        # Al revés del orden de lectura cada carpeta va después de todo su subárbol
+        for folder in reversed(order):
+            if folder != path:
+                self.sizes[os.path.dirname(folder)] += self.sizes[folder]
+            changed[folder] = self.sizes[folder]
+            self._watch(folder)
+        return self.sizes[path]
+
+    def _read_files(self, path):
+        """Lee ``path`` con ``scan_dir`` y guarda el tamaño de cada uno de sus ficheros"""
+        files = self._files[path] = {}
+        return scan_dir(path, self.onerror, on_file=lambda entry, st: files.__setitem__(entry.name, st.st_size))
+
+    def _file_size(self, path):
+        """Bytes del fichero ``path`` o ``None`` si ya no existe o no es un fichero, como en ``scan_dir``"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.onerror(e)
+            return None
+        return st.st_size if stat.S_ISREG(st.st_mode) else None
+
+    def _parents(self, path):
+        """Genera la carpeta y sus antecesores hasta la raíz"""
+        while True:
+            yield path
+            if path == self.root:
+                return
+            parent = os.path.dirname(path)
+            if parent == path:
+                return
+            path = parent
+
+    def _add_delta(self, path, delta, changed):
+        for ancestor in self._parents(path):
+            if ancestor in self.sizes:
+                self.sizes[ancestor] += delta
+                changed[ancestor] = self.sizes[ancestor]
+
+    def poll(self):
+        """Procesa los eventos pendientes.
+
+        Devuelve ``(cambiadas, eliminadas)``: un diccionario ruta -> nuevo tamaño
+        con las carpetas cuyo total ha cambiado (incluidas las nuevas) y el
+        conjunto de carpetas que han desaparecido.
+        """
+        dirty = {}  # Carpeta -> nombres de los ficheros que han cambiado
+        created = set()
+        deleted = set()
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            path = self._paths.get(wd)
+            if path is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._paths[wd]
+                continue
+            if mask & IN_DELETE_SELF:
+                continue  # Lo trata el evento IN_DELETE del padre
+            if mask & IN_ISDIR:
+                child = os.path.join(path, name)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    deleted.discard(child)
+                    created.add(child)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    created.discard(child)
+                    deleted.add(child)
+            elif name:
+                dirty.setdefault(path, set()).add(name)
+
+        changed = {}
+        removed = set()
+        for path in deleted:
+            if path not in self.sizes:
+                continue
+            self._add_delta(os.path.dirname(path), -self.sizes[path], changed)
+            prefix = os.path.join(path, "")
+            for gone in [p for p in self.sizes if p == path or p.startswith(prefix)]:
+                del self.sizes[gone]
+                del self.file_bytes[gone]
+                self._files.pop(gone, None)
+                changed.pop(gone, None)
+                removed.add(gone)
+        for path in created:
+            if path in self.sizes or not os.path.isdir(path) or not self._prune([path], self._depth(path)):
+                continue
+            size = self._scan_new(path, changed)
+            removed.discard(path)
+            self._add_delta(os.path.dirname(path), size, changed)
+        for path, names in dirty.items():
+            if path not in self.file_bytes:
+                continue
+            files = self._files.get(path)
+            if files is None:
+                _, _, file_bytes = self._read_files(path)
+                delta = file_bytes - self.file_bytes[path]
+            else:
+                delta = 0
+                for name in names:
+                    old = files.pop(name, 0)
+                    size = self._file_size(os.path.join(path, name))
+                    if size is not None:
+                        files[name] = size
+                        delta += size
+                    delta -= old
+            if delta:
+                self.file_bytes[path] += delta
+                self._add_delta(path, delta, changed)
+        return changed, removed
+
+    def close(self):
+        self._inotify.close()
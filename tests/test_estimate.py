@@ -0,0 +1,72 @@
+import unittest
+
+from folderscan.estimate import QuickEstimator, _Stats
+
+
+def _stats(seen, *probes):
+    stats = _Stats()
+    stats.seen = seen
+    for estimate in probes:
+        stats.probes += 1
+        stats.total += estimate
+        stats.squares += estimate * estimate
+    return stats
+
+
+class EstimateRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.estimator = QuickEstimator("raiz")
+
+    def test_sin_sondeos_solo_cuenta_lo_leido(self):
+        row = self.estimator._estimate("a", _stats(100))
+        self.assertEqual((row.size, row.low, row.high, row.probes), (100, 100, 100, 0))
+
+    def test_un_sondeo_extrapola_sin_quedar_por_encima_del_maximo(self):
+        row = self.estimator._estimate("a", _stats(100, 1000))
+        self.assertEqual((row.size, row.low, row.high, row.probes), (1000, 100, 1000, 1))
+
+    def test_un_sondeo_no_baja_de_lo_leido(self):
+        row = self.estimator._estimate("a", _stats(500, 200))
+        self.assertEqual((row.size, row.low, row.high), (500, 500, 500))
+
+    def test_dos_sondeos_dan_un_intervalo_alrededor_de_la_media(self):
+        row = self.estimator._estimate("a", _stats(100, 800, 1200))
+        self.assertEqual(row.size, 1000)
+        self.assertLess(row.low, row.size)
+        self.assertGreater(row.high, row.size)
+        self.assertGreaterEqual(row.low, 100)
+        self.assertEqual(row.size - row.low, row.high - row.size)
+
+    def test_exacta(self):
+        stats = _stats(300, 300, 300)
+        stats.exact = 300
+        row = self.estimator._estimate("a", stats)
+        self.assertEqual((row.size, row.low, row.high, row.exact), (300, 300, 300, True))
+
+
+class EstimateTotalTest(unittest.TestCase):
+    def test_total_combina_los_margenes_de_cada_fila(self):
+        estimator = QuickEstimator("raiz")
+        estimator.own_bytes = 10
+        estimator._stats = {"a": _stats(100), "b": _stats(100, 1000), "c": _stats(100, 800, 1200)}
+        rows = estimator.estimates()
+        c = next(row for row in rows if row.path == "c")
+        total = estimator.total(rows)
+        self.assertEqual(total.size, 10 + 100 + 1000 + 1000)
+        self.assertEqual(total.probes, 3)
+        self.assertFalse(total.exact)
+        # La fila de un sondeo no añade margen por arriba: solo cuenta el de la de dos
+        self.assertEqual(total.high - total.size, c.high - c.size)
+        # Por abajo se combinan la de un sondeo (hasta lo leído) y la de dos
+        below = ((1000 - 100) ** 2 + (c.size - c.low) ** 2) ** 0.5
+        self.assertEqual(total.low, round(total.size - below))
+
+    def test_total_sin_filas(self):
+        estimator = QuickEstimator("raiz")
+        estimator.own_bytes = 42
+        total = estimator.total([])
+        self.assertEqual((total.size, total.low, total.high, total.probes, total.exact), (42, 42, 42, 0, True))
+
+
+if __name__ == "__main__":
+    unittest.main()